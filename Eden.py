@@ -10,61 +10,41 @@ This module defines the main entities for the Eden ecosystem simulation:
 - Environmental events: Rain
 
 Each entity is implemented as a class, using an object-oriented design approach
-with inheritance and behavior modeling. Visualisation is handled via custom
-SVG-based markers.
+with inheritance and behavior modeling. Every class declares __slots__ so that
+instances (a Raining drop for every sky cell, a Fossil for every fossil cell)
+carry no per-instance __dict__. Visualisation is handled via custom
+SVG-based markers (Critters/*.svg), read the first time a critter is drawn.
 
 To install dependencies, run:
     pip install -r requirements.txt
 """
 
 
+import functools
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 import random                           #to allow for random movement choices by animals
-import sys
 from matplotlib import patches
 from svgpathtools import svg2paths      #import images for objects - DEPENDENCY - NEED TO INSTALL svgpath2mpl and svgpathtools (pip)
 from svgpath2mpl import parse_path      #same as above
 
 # this is for visualisation of objects - Reference: https://petercbsmith.github.io/marker-tutorial.html
 #MUST USE SVG imports for this to work 
+#REFERENCE: Converted PNG images to SVG with https://convertio.co/
 
-try:
-    butter1path, attributes = svg2paths("Critters/openbutter.svg")
-    butter1_marker = parse_path(attributes[0]['d'])
-    butter1_marker.vertices -= butter1_marker.vertices.mean(axis=0)
-
-    butter2path, attributes = svg2paths("Critters/closedbutter.svg")
-    butter2_marker = parse_path(attributes[0]['d']) 
-    butter2_marker.vertices -= butter2_marker.vertices.mean(axis=0)
-
-    lizard1path, attributes = svg2paths("Critters/lizardleft.svg")
-    lizard1_marker = parse_path(attributes[0]['d'])
-    lizard1_marker.vertices -= lizard1_marker.vertices.mean(axis=0)
-
-    lizard2path, attributes = svg2paths("Critters/lizardright.svg")
-    lizard2_marker = parse_path(attributes[0]['d'])
-    lizard2_marker.vertices -= lizard2_marker.vertices.mean(axis=0)
-
-    antpath, attributes = svg2paths("Critters/ant.svg")
-    ant_marker = parse_path(attributes[0]['d'])
-    ant_marker.vertices -= ant_marker.vertices.mean(axis=0)
-
-    flowerpath, attributes = svg2paths("Critters/flower.svg")
-    flower_marker = parse_path(attributes[0]['d'])
-    flower_marker.vertices -= flower_marker.vertices.mean(axis=0)
-
-    fossilpath, attributes = svg2paths("Critters/fossil.svg")
-    fossil_marker = parse_path(attributes[0]['d'])
-    fossil_marker.vertices -= fossil_marker.vertices.mean(axis=0)
-    #REFERENCE: Converted PNG images to SVG with https://convertio.co/
-
-except FileNotFoundError:
-    print("An SVG cartoon file to plot your critters doesn't exist. Please check file paths. (See README)")
-    sys.exit(1)
-    
-
+CRITTERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Critters")      #the SVG cartoons, next to this file (not the working directory)
 
+@functools.lru_cache(maxsize=None)
+def critterMarker(name):                 #Critters/<name>.svg as a matplotlib marker - read the first time it is drawn, not on import
+    try:
+        path, attributes = svg2paths(os.path.join(CRITTERS_DIR, name + ".svg"))
+    except FileNotFoundError:
+        raise FileNotFoundError("An SVG cartoon file to plot your critters doesn't exist. Please check file paths. (See README): "
+                                + os.path.join(CRITTERS_DIR, name + ".svg"))
+    marker = parse_path(attributes[0]['d'])
+    marker.vertices -= marker.vertices.mean(axis=0)
+    return marker
 
 
 def flipCoords(rcpos, LIMITS):           #makes col (left to right)[1] = x, rows (up to down)[0]
@@ -79,6 +59,9 @@ def flipCoords(rcpos, LIMITS):           #makes col (left to right)[1] = x, rows
 #super classes: Animal, Food and Event #(5)
 
 class Animal:                                                                   #(5)
+    __slots__ = ("name", "pos", "status")                                       #no per-instance __dict__ (smaller critters)
+    #stepChange(moves, ..., rng=random) of every animal: rng is where its random moves come from (its own stream in sync mode, see edenEngine.py)
+
     def __init__(self, name, row, column, status):
         self.name = name
         self.pos = int(row), int(column)
@@ -88,6 +71,8 @@ class Animal:
         return self.pos
     
 class Food:                                                                     #(6)
+    __slots__ = ("name", "pos")
+
     def __init__(self, name, pos):
         self.name = name
         self.pos = pos
@@ -96,6 +81,8 @@ class Food:
             return self.pos
     
 class Event:                                                                    #(7)
+    __slots__ = ("status", "name", "pos")
+
     def __init__(self, name, pos, status):
         self.status = status
         self.name = name
@@ -120,14 +107,16 @@ class Event:
 
 #subclass - inheritance from super class 
 class Ant(Animal):                                          #(5.1)     
+    __slots__ = ("hungry", "fossils", "time_since_fossil", "fullfor")
     size = 0.5                        
     colour = "black"
 
-    def __init__(self, name, row, column, status, hungry, fossils):
+    def __init__(self, name, row, column, status, hungry, fossils, fullfor=20):
         super().__init__(name, row, column, status)
         self.hungry = hungry
         self.fossils = fossils
         self.time_since_fossil = 0              #set time since ant has eaten a fossil
+        self.fullfor = fullfor                  #timesteps it stays not hungry after a fossil (Garden hunger, edenConfig.py behaviour.ant_hunger)
 
     def printit(self):
         print('SPAWNED ANT! Name: ', self.name, '\tPosition ', self.pos,  "\t\"All HAIL the QUEEN!\" ")    
@@ -139,9 +128,21 @@ class Ant(Animal):                                          #(5.1)
                 target_fossils = fossils[np.argmin(distances)]                                                      #Assigns closest fossil
                 return target_fossils
 
-    def stepChange(self, subgrid, fossils):
-
-        if self.hungry == True:
+    def stepChange(self, moves, fossils, field=None, rng=random):                   #moves = legal moves from this cell (ant move table, see edenMoves.py), field = fossil distance field (edenFields.py)
+
+        if self.hungry == True and field is not None:
+            if fossils:
+                move = field.downhill(self.pos, moves)                                      #one step closer to the nearest fossil it can get to
+                if move is not None:
+                    self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])
+                elif field.at(self.pos) != 0 and len(moves) > 0:                            #OR IF NO WAY TO GET TO A FOSSIL: just do random movement
+                    move = rng.choice(moves)
+                    self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])
+                if field.at(self.pos) == 0:                                                 #ant on top of fossil
+                    self.hungry = False
+                    self.time_since_fossil = 0
+
+        elif self.hungry == True:                                                           #no field - head straight for the closest fossil
             target_fossil = self.lookforFood(fossils)
             if target_fossil:
                 target_pos = target_fossil.getPos()                                           #sets target position to target fossil location
@@ -149,9 +150,6 @@ class Ant(Animal):                                          #(5.1)
                 dcol = target_pos[1] - self.pos[1]                                            #dcol = distance in cols between target and self
 
                 if self.pos != target_pos:                                                      # if the ant is not at the target 
-                    validMoves = [(-1, 0), (0, -1), (0, 1), (1, 0)]                             #von Nuemann moves
-                    fosMoves = []                                                               
-
                     if abs(drow) > abs(dcol):                                               #to make sure only 1 row move OR 1 col move 
                         move_drow = 1 if drow > 0 else -1
                         move_dcol = 0
@@ -159,20 +157,11 @@ class Ant(Animal):                                          #(5.1)
                         move_drow = 0
                         move_dcol = 1 if dcol > 0 else -1
 
-                    fosMoves.append((move_drow, move_dcol))
-
-                    if 0 < subgrid[move_drow + 1, move_dcol + 1] < 0.22:                    #ensure move is within ground/tunnel terrain 
+                    if (move_drow, move_dcol) in moves:                                 #ensure move is within ground/tunnel terrain 
                         self.pos = (self.pos[0] + move_drow, self.pos[1] + move_dcol)       #move valid - do it
-                    else:                                                               #OR IF NO WAY TO GET TO FOSSIL: just do random movement
-                        tunMoves = []                                                #moves that are valid and in ground or tunnels 
-
-                        for r,c in validMoves:                                       #for row and column in valid moves
-                            if 0 < subgrid[r+1,c+1] < 0.22:                          # if subgrid is ground or tunnel
-                                tunMoves.append((r, c))                             #add to tunMoves valid move options
-        
-                            if len(tunMoves) > 0:                                       #if tunnel move options are greater than 0
-                                move = random.choice(tunMoves)                           #randomly choose a tunnel move
-                                self.pos = (self.pos[0] + move[0], self.pos[1] + move[1]) 
+                    elif len(moves) > 0:                                                #OR IF NO WAY TO GET TO FOSSIL: just do random movement
+                        move = rng.choice(moves)                                     #randomly choose a tunnel move
+                        self.pos = (self.pos[0] + move[0], self.pos[1] + move[1]) 
 
                 else:                                   #if ant on top of fossil:
                     #if self.pos == target_pos:
@@ -181,25 +170,20 @@ class Ant(Animal):                                          #(5.1)
                         #print("Ant", self.name, "ate Fossil:", target_fossil.name, "!") #inplayEden to ensure all fossils get called out regardless if ants hungry or not
 
         else:                                                            #not hungry and just random crawling/digging
-        
-            validMoves = [(-1,0), (0,-1), (0,1), (1,0)]                  #von Nuemann valid moves in a subgrid
-            tunMoves = []                                                #moves that are valid and in ground or tunnels 
-                
-            for r,c in validMoves:                                       #for row and column in valid moves
-                if 0 < subgrid[r+1,c+1] < 0.22:                          # if subgrid is ground or tunnel
-                    tunMoves.append((r, c))                             #add to tunMoves valid move options
-        
-            if len(tunMoves) > 0:                                       #if tunnel move options are greater than 0
-                move = random.choice(tunMoves)                           #randomly choose a tunnel move
+            if len(moves) > 0:                                          #if tunnel move options are greater than 0
+                move = rng.choice(moves)                              #randomly choose a tunnel move
                 self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])       #new position xy = randomly chosen tunnel move
 
+        self.tick()
+
+    def tick(self):                                                                     #one timestep older
         self.time_since_fossil += 1                                                     #add 1 second onto time since ant ate
-        if self.time_since_fossil > 20:                                                 #stay not hungry for 20 timesteps
+        if self.time_since_fossil > self.fullfor:                                       #stay not hungry for fullfor (20) timesteps
             self.hungry = True                                                          #set hungry back to true
 
     def plotMe(self, ax, LIMITS):                                   #ax sets itself to plot
         XYpos = flipCoords(self.pos, LIMITS)                         #row-col xy stuff
-        ax.plot(XYpos[0], XYpos[1], marker=ant_marker, markersize=6, color=self.colour, zorder=5) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("ant"), markersize=6, color=self.colour, zorder=5) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed
         #circle1 = plt.Circle(XYpos, self.size, color=self.colour)   #makes a dot 
@@ -221,14 +205,16 @@ class Ant(Animal):                                          #(5.1)
 
 #subclass - inheritance from super class
 class Butterfly(Animal):                          #(5.3)
+    __slots__ = ("colour", "hungry", "flowers", "time_since_flower", "fullfor")
     size = 1  
 
-    def __init__(self, name, row, column, colour, status, hungry, flowers): 
+    def __init__(self, name, row, column, colour, status, hungry, flowers, fullfor=15): 
         super().__init__(name, row, column, status)         
         self.colour = colour                   
         self.hungry = hungry            
         self.flowers = flowers
         self.time_since_flower = 0              #set time since butterfly has landed on a flower
+        self.fullfor = fullfor                  #timesteps it stays not hungry after a flower (Garden hunger, edenConfig.py behaviour.butterfly_hunger)
 
     def printit(self):
         print('SPAWNED BUTTERFLY! Name: ', self.name, '\tPosition ', self.pos, '\tColour: ', self.colour, "\t\"Oooo Pretty flowers!\" ")
@@ -240,11 +226,26 @@ class Butterfly(Animal):                          #(5.3)
                 target_flower = flowers[np.argmin(distances)]
                 return target_flower
 
-    def stepChange(self, subgrid, flowers, raindance):
+    def stepChange(self, moves, flowers, raindance, field=None, rng=random):        #moves = legal moves from this cell (butterfly or butterfly rain move table, see edenMoves.py), field = flower distance field (edenFields.py)
         
         if self.status == "alive":          #If butterfly is alive, it's not raining and it's hungry:
             if raindance == False:
-                if self.hungry == True:
+                if self.hungry == True and field is not None:
+                    move = field.downhill(self.pos, moves)                                  #one step closer to the nearest flower it can fly to
+                    if move is not None:
+                        self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])
+                    elif field.at(self.pos) != 0 and len(moves) > 0:                        #no way to a flower - fly about
+                        move = rng.choice(moves)
+                        self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])
+
+                    if field.at(self.pos) == 0:
+                        self.hungry = False             #set hunger to false now butterfly has eaten
+                        self.time_since_flower = 0      #reset counter (since last ate)
+                        for flower in flowers:
+                            if flower.pos == self.pos:
+                                print("Butterfly", self.name, "ate some nectar from Flower:", flower.name, "!")
+
+                elif self.hungry == True:                                   #no field - fly straight for the closest flower
                     target_flower = self.lookforFood(flowers)
 
                     if target_flower:                               #Determine move to move closer to target flower but as Moore Neighbours moves
@@ -273,35 +274,20 @@ class Butterfly(Animal):                          #(5.3)
                             self.time_since_flower = 0      #reset counter (since last ate)
                             print("Butterfly", self.name, "ate some nectar from Flower:", target_flower.name, "!")
 
-                else:                           #If butterfly is alive, it's not raining and it's not hungry
-                    validMoves = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]     #MOORE NEIGHBOURS
-                    flyMoves = []                                                                   #moves that are in are not into the ground and tunnels, Clouds
-
-                    for r,c in validMoves:                                                                  #for row and column in valid moves
-                        
-                        if subgrid[r+1,c+1] > 0.35:                                              #subgrid 3x3 around bfly but matrix read from centre, bfly wont enter terrain cells less than 0.2 (border, ground, tunnels)
-                            flyMoves.append((r, c))                                                 #confirmed moves once checked its not ground, clouds or tunnel
-
-                    if len(flyMoves) > 0:                                                             #if fly move options are greater than 0
-                        move = random.choice(flyMoves)                                              #randomly choose a fly move
+                else:                           #If butterfly is alive, it's not raining and it's not hungry - Moore moves not into the ground, tunnels or clouds
+                    if len(moves) > 0:                                                                #if fly move options are greater than 0
+                        move = rng.choice(moves)                                                 #randomly choose a fly move
                         self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])                   #new position xy = randomly chosen 
                 
                 self.time_since_flower += 1                                                     #add 1 second onto time since butterfly ate
-                if self.time_since_flower >=15:
+                if self.time_since_flower >= self.fullfor:
                     self.hungry = True
 
             else:                                                       #If butterfly is alive, it's raining and regardless if hungry
                 self.hungry = False                                     #hunger goes to false
-                validrainMoves = [(1,1),(1,0),(0,0),(1,-1)]                #only down movements and not moving
-                flyrainMoves = []                                                                   #moves that are in are not into the ground and tunnels, Clouds
-
-                for r,c in validrainMoves:                                                                 #for row and column in valid moves
-                    if subgrid[r+1,c+1] > 0.35:                                              #subgrid 3x3 around bfly but matrix read from centre, bfly wont enter terrain cells less than 0.2 (border, ground, tunnels)
-                            flyrainMoves.append((r,c))
-
-                    if len(flyrainMoves) > 0:                                                             #if fly move options are greater than 0
-                        rainmove = random.choice(flyrainMoves)                                              #randomly choose a fly move
-                        self.pos = (self.pos[0] + rainmove[0], self.pos[1] + rainmove[1]) 
+                if len(moves) > 0:                                      #only down movements and not moving
+                    rainmove = rng.choice(moves)                                                     #randomly choose a fly move
+                    self.pos = (self.pos[0] + rainmove[0], self.pos[1] + rainmove[1]) 
           
     def butterdeath(self, killer):                                      #if butterfly is dead: the death of a butterfly triggered by being at the same position or in reach of a lizard, killer = lizards name
         self.status = "dead"
@@ -312,7 +298,7 @@ class Butterfly(Animal):                          #(5.3)
 
     def plotMeopen(self, ax, LIMITS):                                 
         XYpos = flipCoords(self.pos, LIMITS)
-        ax.plot(XYpos[0], XYpos[1], marker=butter1_marker, markersize=15, color=self.colour, zorder=4)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("openbutter"), markersize=15, color=self.colour, zorder=4)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed
         #circle1 = plt.Circle(XYpos, self.size, color=self.colour)
@@ -320,7 +306,7 @@ class Butterfly(Animal):                          #(5.3)
 
     def plotMeclosed(self, ax, LIMITS):                                                          
         XYpos = flipCoords(self.pos, LIMITS)
-        ax.plot(XYpos[0], XYpos[1], marker=butter2_marker, markersize=15, color=self.colour, zorder=3)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("closedbutter"), markersize=15, color=self.colour, zorder=3)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed
         #circle1 = plt.Circle(XYpos, self.size, color= "red")                                   #makes dot red to show flapping
@@ -328,39 +314,33 @@ class Butterfly(Animal):                          #(5.3)
 
 
 #CATERPILLARS
-#Caterpillars are born when there is less than the original amount of butterflies
-#Only 1 caterpillar exists at a time so butterflies don't get rejuvinated numbers easily
+#Caterpillars are born when there is less than the original amount of butterflies - one for every butterfly missing (that is not already on its way)
 #Caterpillars are born in random location at specific height on 1 tree in the plot
 #They can only move left and right and do not enter the sky
-#After ()timesteps of caterpillar being born, they turn into a cacoon
+#Each caterpillar has its own stage and timer (edenLifecycle.py): after 9 timesteps of caterpillar being born, it turns into a cacoon
 #The cacoon sits in position of caterpillars last position
-#After ()timesteps of cacoon, it turns into a butterfly and joins butterfly class
+#After 6 timesteps of cacoon, it turns into a butterfly and joins butterfly class
 #Caterpillars are plotted as a horizonta Ellipse patch with green edge and red fill
 #Cacoonss are plotted as a vertical Ellipse patch - olive colour
 #Numbers of Caterpillars are plotted as x-axis title
-#FUTURE WORKS: more caterpillars, more locations, SVG images to replace plot patches (drawn by me), caterpillars to seek leaves to eat
+#FUTURE WORKS: more locations, SVG images to replace plot patches (drawn by me), caterpillars to seek leaves to eat
 
 #subclass - inheritance from super class
 class Caterpillar(Animal):                          #(5.4)
+    __slots__ = ("stage",)
 
-    def __init__(self, name, row, column, status):
+    def __init__(self, name, row, column, status, stage="caterpillar"):
         super().__init__(name, row, column, status)
+        self.stage = stage                                                      #"caterpillar" or "cocoon" (set by edenLifecycle.Lifecycle)
 
 
     def printit(self):
         print('\nSPAWNED CATERPILLAR! Name: ', self.name, '\tPosition ', self.pos,)
         print("\t\"i'M a HUnGRy HUnGRy CAtErpilLAR!\" ")    
     
-    def stepChange(self, subgrid):
-        validMoves = [(0,-1), (0, 1)]                                                               #only can move left and right
-        branchMoves = []                                                                             #moves that are valid and in grass or tree trunks (not sky)
-               
-        for r,c in validMoves:                                                                      #for row and column in valid moves
-            if subgrid[r+1,c+1] <0.8:                                                          # if subgrid is on tree
-                branchMoves.append((r, c))                                                       #add to branchMoves -confirmed move option if valid
-
-        if len(branchMoves) > 0:                                                                 
-            move = random.choice(branchMoves)                                                    
+    def stepChange(self, moves, rng=random):                                                                    #only can move left and right along the tree (caterpillar move table)
+        if len(moves) > 0:                                                                 
+            move = rng.choice(moves)                                                    
             self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])                               
 
     def plotMe(self, ax, LIMITS):                                               
@@ -390,6 +370,7 @@ class Caterpillar(Animal):                          #(5.4)
 
 #subclass - inheritance from super class
 class Lizard(Animal):                 #(5.4)                                                    
+    __slots__ = ("hungry",)
     size = 1.5                         
     colour = "darkgoldenrod"
 
@@ -403,23 +384,16 @@ class Lizard(Animal):                 #(5.4)
     def inReach(self):                              #one row above their head to check butterfly location is inreach to eat
         return (self.pos[0]-1, self.pos[1])
 
-    def stepChange(self, subgrid):
-
-        validMoves = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]                  #Moore
-        grassMoves = []                                                                             #moves that are valid and in grass or tree trunks or rocks
-               
-        for r,c in validMoves:                                                                      #for row and column in valid moves
-            if 0.24 < subgrid[r+1,c+1] < 0.79:                                                           # if subgrid is in grass or rock or on tree
-                grassMoves.append((r, c))                                                       #add to grassMoves -confirmed move option if valid
+    def stepChange(self, moves, rng=random):                                                                    #Moore moves in grass or tree trunks or rocks (lizard move table)
 
-        if len(grassMoves) > 0:                                                                 #if grassmoves move options are greater than 0
-            move = random.choice(grassMoves)                                                    #randomly choose a grass move
+        if len(moves) > 0:                                                                      #if grassmoves move options are greater than 0
+            move = rng.choice(moves)                                                         #randomly choose a grass move
             self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])                               #new position xy = randomly chosen tunnel move
 
         #2 plots alternating to make it look like lizards are walking/climbing
     def plotMeright(self, ax, LIMITS):                                               
         XYpos = flipCoords(self.pos, LIMITS) 
-        ax.plot(XYpos[0], XYpos[1], marker=lizard1_marker, markersize=45, color=self.colour, zorder=6)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("lizardleft"), markersize=45, color=self.colour, zorder=6)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed 
         #circle1 = plt.Circle(XYpos, self.size, color=self.colour)                                   
@@ -427,7 +401,7 @@ class Lizard(Animal):                 #(5.4)
 
     def plotMeleft(self, ax, LIMITS):                                                          #for walking animation - left, right, left, right
         XYpos = flipCoords(self.pos, LIMITS) 
-        ax.plot(XYpos[0], XYpos[1], marker=lizard2_marker, markersize=45, color=self.colour, zorder=7) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("lizardright"), markersize=45, color=self.colour, zorder=7) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed
         #circle1 = plt.Circle(XYpos, self.size, color= "red")                                   
@@ -447,13 +421,15 @@ class Lizard(Animal):                 #(5.4)
 #subclass - inheritance from super class
 
 class Worm(Animal):             #(5.5)
+    __slots__ = ("hungry", "oldtail", "lifespan")
     size = 1.2                          
     colour = "darkseagreen"
 
-    def __init__(self, name, row, column, status, hungry):                             #1 worm appears at start of Eden and then 1 is born when the existing dies
+    def __init__(self, name, row, column, status, hungry, lifespan=None):             #worms appear at the start of Eden and a new one is born for every one that dies
         super().__init__(name, row, column, status)
         self.hungry = hungry
         self.oldtail = [self.pos]                                                     #list of positions of tail so worms grow and slowly take over ground
+        self.lifespan = lifespan                                                      #tail length (age) it dies of old age at - the garden draws it
 
     def printit(self):                      
         print('\nSPAWNED WORM! Name: ', self.name, '\tPosition ', self.pos, "\t\"Hello, I'm Dr Worm!\"")    
@@ -461,17 +437,10 @@ class Worm(Animal):             #(5.5)
     def storeoldtail(self):                                                           #store location of current position into  tail list
         self.oldtail.append(self.pos)
     
-    def stepChange(self, subgrid):
+    def stepChange(self, moves, rng=random):                                                        #von Nuemann moves in ground or tunnel and NOT OLD tail (0.7) or fossils (worm move table)
         if self.status == "alive": 
-            validMoves = [(-1,0), (0,-1), (0,0), (0,1), (1,0)]                                         #von Nuemann valid moves in a subgrid
-            slugMoves = []
-             
-            for r,c in validMoves:                                                          #for row and column in valid moves
-                if 0 < subgrid[r+1,c+1] < 0.21:                                          # if subgrid is ground or tunnel and NOT OLD tail (0.7) and not fossils (0.21)
-                    slugMoves.append((r, c))                                        #add to slugMoves -valid move options
-        
-            if len(slugMoves) > 0:                                                      #if slugMoves move options are greater than 0
-                move = random.choice(slugMoves)                                      #randomly choose a valid slug move
+            if len(moves) > 0:                                                      #if slugMoves move options are greater than 0
+                move = rng.choice(moves)                                      #randomly choose a valid slug move
                 self.pos = (self.pos[0] + move[0], self.pos[1] + move[1])           #new position xy = randomly chosen tunnel move
 
     def wormdeath(self):                                                        #Worm dies after ()timesteps of being alive, worm turns into fossils 
@@ -502,16 +471,13 @@ class Worm(Animal):             #(5.5)
 
 #subclass - inheritance from super class
 class Flower(Food):                            #(6.1)     #flowers created for butterflys to land on and eat nectar (only placed at 0.745)
-
-    def __init__(self, name, pos):
-        super().__init__(name, pos)
-        self.colour = "pink"            
-        self.size = 0.5                   
-
+    __slots__ = ()
+    colour = "pink"            
+    size = 0.5                   
 
     def plotMe(self, ax, LIMITS):
         XYpos = flipCoords(self.pos, LIMITS)
-        ax.plot(XYpos[0], XYpos[1], marker=flower_marker, markersize=5, color=self.colour, zorder=1) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("flower"), markersize=5, color=self.colour, zorder=1) #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                     #zorder layers: https://saturncloud.io/blog/specifying-the-order-of-matplotlib-layers-a-guide/
         #redundant but incase SVG images are removed
         #circle1 = plt.Circle(XYpos, self.size, color=self.colour)
@@ -524,18 +490,17 @@ class Flower(Food):                            #(6.1)     #flowers created for b
 #Fossils are seeked out by ants when they are hungry and are eaten by ants (disappear)
 #Numbers of fossils are plotted as x-axis title
 #Fossils are plotted using SVG image (drawn by me)
+#Fossil objects are reused from timestep to timestep by the engine (see Garden.stepFood) rather than made new each time
 
 #subclass - inheritance from super class
 class Fossil(Food):                                         #fossils created for ants to crawl to and chew on (only places at 0.21)
+    __slots__ = ()
+    colour = "white"            
+    size = 0.2 
 
-    def __init__(self, name, pos):
-        super().__init__(name, pos)
-        self.colour = "white"            
-        self.size = 0.2 
-    
     def plotMe(self, ax, LIMITS):
         XYpos = flipCoords(self.pos, LIMITS)
-        ax.plot(XYpos[0], XYpos[1], marker=fossil_marker, markersize=4, color=self.colour)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
+        ax.plot(XYpos[0], XYpos[1], marker=critterMarker("fossil"), markersize=4, color=self.colour)  #matplotlib markers https://matplotlib.org/stable/api/markers_api.html, 
                                                                                                    
         #circle1 = plt.Circle(XYpos, self.size, color=self.colour)
         #ax.add_patch(circle1)
@@ -552,7 +517,5 @@ class Fossil(Food):                                         #fossils created for
 
 #subclass - inheritance from super class
 class Raining(Event):           #(7.1)
-
-    def __init__(self, name, pos, status):
-        super().__init__(name, pos, status)
+    __slots__ = ()
 
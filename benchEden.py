@@ -0,0 +1,190 @@
+# benchEden.py
+# Benchmarks for the Eden Simulation engine
+
+"""
+Headless benchmarks for the Eden engine. Each benchmark runs a Garden without
+the matplotlib window (and without the terminal log) and prints its results.
+
+    python benchEden.py memory 2000                 (memory over 2000 timesteps)
+    python benchEden.py memory 2000 --fossils 0.2   (a fifth of the ground starts as fossils)
+    python benchEden.py speed 1000                  (timesteps per second and time spent in each phase)
+    python benchEden.py speed 1000 --sync           (the same with synchronous ants and worms)
+    python benchEden.py flat 10000 --every 1000     (memory by subsystem and phase - fails if a long run keeps growing)
+
+The memory benchmark prints the size of one instance of every Eden class, then
+traces every allocation (tracemalloc) while the garden plays and reports the
+memory held every --every timesteps, the peak, and how many Fossil objects the
+engine made. The speed benchmark times every phase of Garden.step().
+
+The flat benchmark plays a long headless run with tracemalloc on. Every
+--every timesteps it prints the memory held, the size of every subsystem
+(edenMemory.footprint) and what each phase kept in that timestep
+(edenMemory.stepTraced). The first report is the baseline: the run fails
+(exit status 1) if the memory held at the end is more than --allow KB above
+it. Every timestep is traced, so it plays about 50 timesteps a second: the
+default 10000 timesteps take a few minutes, a million take hours.
+"""
+
+
+import argparse
+import contextlib
+import numpy as np
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from Eden import *
+from edenEngine import PHASES, Garden
+from edenMemory import SUBSYSTEMS, footprint, stepTraced
+from playEden import load_scenario
+
+
+def makeGarden(seed=None, fossils=0.0, world=None, alive=None, sync=False):
+    if seed is not None:
+        random.seed(seed)
+    scenario = load_scenario(world, alive)
+    terrain = np.array(scenario.backdrop)
+    if fossils > 0:                                                             #turn a share of the plain ground into fossils
+        ground = np.flatnonzero(terrain == 0.2)
+        chosen = np.random.default_rng(seed).choice(ground, int(len(ground)*fossils), replace=False)
+        terrain.flat[chosen] = 0.21
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        return Garden(terrain, scenario.critters, sync=sync)
+
+def playQuietly(garden, timesteps, quiet):                                      #quiet: an open devnull for the garden's terminal log
+    with contextlib.redirect_stdout(quiet):
+        for t in range(timesteps):
+            garden.step()
+
+
+def instanceSize(obj):                                                          #object plus its __dict__ (if it has one)
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size = size + sys.getsizeof(obj.__dict__)
+    return size
+
+def benchMemory(args):
+    samples = [Ant("A1", 1, 1, "alive", False, []), Butterfly("B1", 1, 1, "blue", "alive", False, []),
+               Caterpillar("C1", 1, 1, "alive"), Lizard("L1", 1, 1, "alive", False), Worm("W1", 1, 1, "alive", False),
+               Flower("F1", (1, 1)), Fossil("FF1", (1, 1)), Raining("R1", (1, 1), False)]
+    print("Bytes per instance:")
+    for obj in samples:
+        print("   ", type(obj).__name__.ljust(12), instanceSize(obj))
+
+    made = [0]
+    fossilinit = Fossil.__init__
+    def countingInit(self, name, pos):                                          #count every Fossil the engine makes
+        made[0] = made[0] + 1
+        fossilinit(self, name, pos)
+    Fossil.__init__ = countingInit
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    garden = makeGarden(args.seed, args.fossils, args.world, args.alive, args.sync)
+    print("\nTimestep  Fossils  Memory held (KB)")
+    played = 0
+    with open(os.devnull, "w") as quiet:
+        while played < args.timesteps:
+            chunk = min(args.every, args.timesteps - played)
+            playQuietly(garden, chunk, quiet)
+            played = played + chunk
+            current, peak = tracemalloc.get_traced_memory()
+            print(str(played).rjust(8), str(len(garden.fossilpos)).rjust(8), str(round(current/1024, 1)).rjust(17))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    Fossil.__init__ = fossilinit
+
+    print("\nPeak memory: ", round(peak/1024, 1), "KB")
+    print("Fossil objects made: ", made[0], "for", args.timesteps, "timesteps")
+    print("Time: ", round(time.perf_counter() - start, 2), "s")
+
+
+def benchSpeed(args):
+    garden = makeGarden(args.seed, args.fossils, args.world, args.alive, args.sync)
+    spent = dict.fromkeys(PHASES, 0.0)
+    clock = time.perf_counter
+    start = clock()
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        for t in range(args.timesteps):
+            for phase in PHASES:
+                began = clock()
+                getattr(garden, phase)()
+                spent[phase] = spent[phase] + clock() - began
+            garden.t = garden.t + 1
+    total = clock() - start
+
+    print("Timesteps: ", args.timesteps, "  Time: ", round(total, 2), "s  ", round(args.timesteps/total, 1), "timesteps/s")
+    for phase in PHASES:
+        print("   ", phase.ljust(16), str(round(spent[phase]*1000/args.timesteps, 3)).rjust(9), "ms/timestep")
+
+
+def benchFlat(args):
+    tracemalloc.start()
+    garden = makeGarden(args.seed, args.fossils, args.world, args.alive, args.sync)
+    start = time.perf_counter()
+    print("Timestep  Held (KB)  " + "  ".join(name for name in SUBSYSTEMS) + "   (KB)")
+    baseline = None
+    played = 0
+    with open(os.devnull, "w") as quiet:                                        #opened before the baseline, so it is not counted as growth
+        while played < args.timesteps:
+            chunk = min(args.every, args.timesteps - played)
+            playQuietly(garden, chunk - 1, quiet)
+            with contextlib.redirect_stdout(quiet):
+                kept = stepTraced(garden)                                       #the last timestep of every chunk is traced phase by phase
+            played = played + chunk
+            held = tracemalloc.get_traced_memory()[0] / 1024
+            if baseline is None:
+                baseline = held
+            sizes = footprint(garden)
+            print(str(played).rjust(8), str(round(held, 1)).rjust(10), "  ".join(str(round(sizes[name]/1024, 1)).rjust(len(name)) for name in SUBSYSTEMS))
+            if args.phases:
+                for phase, (size, top) in kept.items():
+                    where = "" if top is None or top.size_diff <= 0 else "   most at " + str(top.traceback[0])
+                    print("   ", phase.ljust(16), str(size).rjust(8), "bytes kept" + where)
+    held = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+
+    growth = held - baseline
+    print("\nTime: ", round(time.perf_counter() - start, 2), "s   Grew", round(growth, 1), "KB after timestep", min(args.every, args.timesteps))
+    if growth > args.allow:
+        print("Memory is not flat: grew more than", args.allow, "KB")
+        sys.exit(1)
+    print("Memory is flat (within", args.allow, "KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the Eden engine")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    memory = sub.add_parser("memory", help="memory held over a long run with many fossils")
+    memory.add_argument("timesteps", type=int, nargs="?", default=2000)
+    memory.add_argument("--every", type=int, default=500, help="report every this many timesteps")
+    memory.add_argument("--fossils", type=float, default=0.05, help="share of the ground that starts as fossils")
+    memory.set_defaults(run=benchMemory)
+
+    speed = sub.add_parser("speed", help="timesteps per second and time per phase")
+    speed.add_argument("timesteps", type=int, nargs="?", default=1000)
+    speed.add_argument("--fossils", type=float, default=0.0, help="share of the ground that starts as fossils")
+    speed.set_defaults(run=benchSpeed)
+
+    flat = sub.add_parser("flat", help="memory held by subsystem and phase over a long run - fails if it keeps growing")
+    flat.add_argument("timesteps", type=int, nargs="?", default=10000)
+    flat.add_argument("--every", type=int, default=1000, help="report (and trace every phase) every this many timesteps")
+    flat.add_argument("--fossils", type=float, default=0.0, help="share of the ground that starts as fossils")
+    flat.add_argument("--allow", type=float, default=256, help="KB the memory held may grow after the first report")
+    flat.add_argument("--phases", action="store_true", help="also print what each phase kept")
+    flat.set_defaults(run=benchFlat)
+
+    for bench in sub.choices.values():
+        bench.add_argument("--seed", type=int, default=1)
+        bench.add_argument("--world", default=None, help="worldscene csv (default data/worldscene.csv)")
+        bench.add_argument("--alive", default=None, help="alive csv or .npy population file (default data/alive.csv)")
+        bench.add_argument("--sync", action="store_true", help="synchronous ants and worms (see edenEngine.py)")
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
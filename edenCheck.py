@@ -0,0 +1,215 @@
+# edenCheck.py
+# Seeded equivalence check between the reference engine and a candidate engine
+
+"""
+Plays the reference engine (ReferenceGarden, edenReference.py: the Eden.py
+stepChange logic one animal after another, written without the move tables,
+distance fields and lifecycle arrays that make Garden fast) and a candidate
+engine from the same scenario and seed, and compares what they do timestep by
+timestep:
+- the population counts (Garden.counts())
+- the terrain histogram: how many cells hold each terrain value (sky, tunnel,
+  fossil, worm tail ...)
+- the events of the timestep: the lifecycle stage changes (Garden.lifeevents)
+  and the rain
+
+    python edenCheck.py 300 serial                  (exact: every timestep must match)
+    python edenCheck.py 300 sync --seeds 20         (statistical: 20 seeds each, compared every --every timesteps)
+    python edenCheck.py 300 mymodule:makeEngine     (any engine - see below)
+
+Exact mode plays both engines in lock step, each from its own random stream,
+and stops at the first timestep where anything differs. It is for engines
+that should make the same random draws in the same order, like Garden.
+
+An engine that draws in a different order (or in other processes) can only
+match in distribution. Statistical mode plays --seeds seeds on each engine.
+Every --every timesteps it compares the mean of every count, every terrain
+value and the number of events of every kind so far, over the seeds, with
+Welch's t-test. A checkpoint diverges when any p-value is below --alpha
+divided by the number of quantities compared (Bonferroni), or when a quantity
+is the same for every seed of both engines but not the same value.
+
+Both modes print the first timestep that diverged and exit with status 1.
+
+Engines are named in ENGINES, or given as module:function - a function
+(backdrop, critters, seed) that returns an object with step(), counts(), a
+terrain and lifeevents/raindance (a Garden, or an object holding one as
+.garden), and optionally close(). The random module is seeded before it is
+called.
+"""
+
+
+import argparse
+import collections
+import contextlib
+import importlib
+import numpy as np
+import os
+import random
+import sys
+import warnings
+
+from scipy import stats
+
+from edenEngine import Garden
+from edenParallel import ParallelGarden
+from edenReference import ReferenceGarden
+from playEden import load_scenario
+
+
+ENGINES = {
+    "reference": lambda backdrop, critters, seed: ReferenceGarden(backdrop, critters),
+    "serial":   lambda backdrop, critters, seed: Garden(backdrop, critters),
+    "sync":     lambda backdrop, critters, seed: Garden(backdrop, critters, sync=True, seed=seed),
+    "parallel": lambda backdrop, critters, seed: ParallelGarden(backdrop, critters, workers=2, seed=seed),
+}
+
+
+def findEngine(name):                                                           #ENGINES name or module:function
+    if name in ENGINES:
+        return ENGINES[name]
+    module, sep, function = name.partition(":")
+    if not sep:
+        raise ValueError("unknown engine " + name + " (use one of " + ", ".join(ENGINES) + " or module:function)")
+    return getattr(importlib.import_module(module), function)
+
+def observe(engine):                                                            #(counts, terrain histogram, events) of the timestep just played
+    garden = getattr(engine, "garden", engine)                                  #ParallelGarden keeps the lifecycle and rain in its coordinator garden
+    values, cells = np.unique(np.round(engine.terrain, 3), return_counts=True)
+    events = list(garden.lifeevents)
+    if garden.raindance:
+        events.append(("rain", "raining"))
+    return engine.counts(), dict(zip(values.tolist(), cells.tolist())), events
+
+
+class Run:                                                                      #one engine playing from its own random stream
+
+    def __init__(self, name, backdrop, critters, seed):
+        random.seed(seed)
+        self.quiet = open(os.devnull, "w")                                      #the engine's terminal log, for every timestep
+        with contextlib.redirect_stdout(self.quiet):
+            self.engine = findEngine(name)(backdrop, critters, seed)
+        self.state = random.getstate()
+
+    def step(self):
+        random.setstate(self.state)
+        with contextlib.redirect_stdout(self.quiet):
+            self.engine.step()
+        self.state = random.getstate()
+        return observe(self.engine)
+
+    def close(self):
+        if hasattr(self.engine, "close"):
+            self.engine.close()
+        self.quiet.close()
+
+
+def difference(expected, got):                                                  #what differs between two observations ("" if nothing)
+    counts, terrain, events = expected
+    counts2, terrain2, events2 = got
+    found = []
+    for name in sorted(set(counts) | set(counts2)):
+        if counts.get(name) != counts2.get(name):
+            found.append(name + " " + str(counts.get(name)) + " != " + str(counts2.get(name)))
+    for value in sorted(set(terrain) | set(terrain2)):
+        if terrain.get(value, 0) != terrain2.get(value, 0):
+            found.append("terrain " + str(value) + " cells " + str(terrain.get(value, 0)) + " != " + str(terrain2.get(value, 0)))
+    if events != events2:
+        k = next((k for k, (a, b) in enumerate(zip(events, events2)) if a != b), min(len(events), len(events2)))
+        found.append("event " + str(k + 1) + " " + str(events[k] if k < len(events) else None) + " != " + str(events2[k] if k < len(events2) else None))
+    return ",  ".join(found)
+
+def checkExact(reference, candidate, backdrop, critters, seed, timesteps):     #first timestep that differs (None) and what differs
+    runs = [Run(reference, backdrop, critters, seed), Run(candidate, backdrop, critters, seed)]
+    try:
+        for t in range(1, timesteps + 1):
+            found = difference(runs[0].step(), runs[1].step())
+            if found:
+                return t, found
+        return None, ""
+    finally:
+        for run in runs:
+            run.close()
+
+
+def quantities(observed, events):                                               #one observation -> {quantity: number}
+    counts, terrain, step_events = observed
+    events.update(stage for name, stage in step_events)
+    found = dict(counts)
+    found.update(("terrain " + str(value), cells) for value, cells in terrain.items())
+    found.update(("events " + stage, n) for stage, n in events.items())
+    return found
+
+def playCheckpoints(name, backdrop, critters, seed, timesteps, every):          #[(timestep, {quantity: number})] every `every` timesteps
+    run = Run(name, backdrop, critters, seed)
+    events = collections.Counter()                                              #events so far by kind
+    checkpoints = []
+    try:
+        for t in range(1, timesteps + 1):
+            found = quantities(run.step(), events)
+            if t % every == 0 or t == timesteps:
+                checkpoints.append((t, found))
+    finally:
+        run.close()
+    return checkpoints
+
+def checkStatistical(reference, candidate, backdrop, critters, seeds, timesteps, every, alpha):
+    #first checkpoint that differs (None) and what differs
+    played = [[playCheckpoints(name, backdrop, critters, seed, timesteps, every) for seed in seeds] for name in (reference, candidate)]
+    for k, t in enumerate(t for t, found in played[0][0]):
+        samples = [[checkpoints[k][1] for checkpoints in runs] for runs in played]
+        names = sorted(set().union(*samples[0], *samples[1]))
+        bound = alpha / len(names)
+        diverged = []
+        for name in names:
+            a = np.array([sample.get(name, 0) for sample in samples[0]], dtype=float)
+            b = np.array([sample.get(name, 0) for sample in samples[1]], dtype=float)
+            if a.std() == 0 and b.std() == 0:
+                p = 1.0 if a[0] == b[0] else 0.0
+            else:
+                with warnings.catch_warnings():                                 #nearly constant samples only lose precision, not the answer
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    p = stats.ttest_ind(a, b, equal_var=False).pvalue
+            if p < bound:
+                diverged.append(name + " mean " + str(round(a.mean(), 2)) + " vs " + str(round(b.mean(), 2)) + " (p " + format(p, ".2g") + ")")
+        if diverged:
+            return t, ",  ".join(diverged)
+    return None, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a candidate Eden engine against the reference engine")
+    parser.add_argument("timesteps", type=int)
+    parser.add_argument("candidate", help="engine to check: " + ", ".join(ENGINES) + " or module:function")
+    parser.add_argument("--reference", default="reference", help="engine to check against (default reference)")
+    parser.add_argument("--seed", type=int, default=1, help="seed (the first seed with --seeds)")
+    parser.add_argument("--seeds", type=int, default=1, help="more than 1: statistical check over this many seeds")
+    parser.add_argument("--every", type=int, default=50, help="statistical check every this many timesteps")
+    parser.add_argument("--alpha", type=float, default=0.001, help="statistical check: chance of a false divergence at a checkpoint")
+    parser.add_argument("--world", default=None, help="worldscene csv or .npy (default data/worldscene.csv)")
+    parser.add_argument("--alive", default=None, help="alive csv or .npy population file (default data/alive.csv)")
+    args = parser.parse_args()
+
+    try:
+        findEngine(args.reference), findEngine(args.candidate)
+    except (ValueError, ImportError, AttributeError) as e:
+        print(e)
+        sys.exit(2)
+    scenario = load_scenario(args.world, args.alive)
+    backdrop = np.array(scenario.backdrop)
+
+    if args.seeds > 1:
+        seeds = range(args.seed, args.seed + args.seeds)
+        print("Statistical check of", args.candidate, "against", args.reference, "over seeds", seeds[0], "to", seeds[-1], "for", args.timesteps, "timesteps")
+        t, found = checkStatistical(args.reference, args.candidate, backdrop, scenario.critters, seeds, args.timesteps, args.every, args.alpha)
+    else:
+        print("Exact check of", args.candidate, "against", args.reference, "with seed", args.seed, "for", args.timesteps, "timesteps")
+        t, found = checkExact(args.reference, args.candidate, backdrop, scenario.critters, args.seed, args.timesteps)
+
+    if t is not None:
+        print("Diverged at timestep", str(t) + ":", found)
+        sys.exit(1)
+    print("Equivalent for", args.timesteps, "timesteps")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# edenConfig.py
+# Run configuration for playEden.py: a TOML or JSON file and command line overrides
+
+"""
+Everything a run of playEden.py can be set up with, in four sections:
+
+    [run]         steps, sundial (D or N), seed, world, alive, sync
+    [render]      renderer, render_every, rate, pause, pipeline, frames
+    [output]      record, counts, log
+    [behaviour]   ant_hunger, butterfly_hunger, rain_start, rain_end,
+                  worm_life_min, worm_life_max
+
+A configuration file holds any of these (TOML, or JSON with the same
+sections), for example runs/sweep.toml:
+
+    [run]
+    steps = 2000
+    sundial = "N"
+    seed = 7
+
+    [render]
+    renderer = "none"
+
+    [output]
+    counts = "runs/counts7.csv"
+
+    [behaviour]
+    ant_hunger = 30
+
+    python playEden.py --config runs/sweep.toml --seed 8 --counts runs/counts8.csv
+
+Settings not in the file keep their default (OPTIONS), and every setting can
+be given on the command line too (--render-every, --ant-hunger ...), which
+wins over the file. Unknown settings and values of the wrong type are errors.
+
+Renderers: none (no drawing - the fastest headless run), matplotlib (the
+Eden window), terminal (edenTerminal.py) and export (a PNG of every drawn
+frame in the frames directory, without a window).
+Outputs: record (a recording for replayEden.py, see edenRecord.py), counts
+(a csv of the population counts after every timestep) and log (the garden's
+log goes to this file instead of the terminal).
+Behaviour: the timesteps ants (20) and butterflies (15) stay not hungry after
+eating, the rain window (it rains after timestep 35 and before 50) and the
+range of a worm's life (12 to 30 timesteps).
+"""
+
+
+import argparse
+import json
+import tomllib
+
+from edenEngine import HUNGER, RAIN, WORMLIFE
+
+
+RENDERERS = ("none", "matplotlib", "terminal", "export")
+
+#section -> setting -> (default, type, what it is); None means not set
+OPTIONS = {
+    "run": {
+        "steps":            (None, int, "timesteps to play"),
+        "sundial":          (None, str, "D (day) or N (night)"),
+        "seed":             (None, int, "seed for the random module (the same seed plays the same run)"),
+        "world":            (None, str, "worldscene csv or .npy (default data/worldscene.csv)"),
+        "alive":            (None, str, "alive csv or .npy population file (default data/alive.csv)"),
+        "sync":             (False, bool, "synchronous ants and worms (see edenEngine.py)"),
+    },
+    "render": {
+        "renderer":         ("matplotlib", str, "one of " + ", ".join(RENDERERS)),
+        "render_every":     (1, int, "only draw every Nth timestep"),
+        "rate":             (None, float, "hold this many timesteps per second, skipping frames when behind"),
+        "pause":            (0.01, float, "seconds each frame is shown (without --rate)"),
+        "pipeline":         (False, bool, "simulate in a second process while this one draws (edenPipeline.py)"),
+        "frames":           ("frames", str, "directory the export renderer writes its PNGs to"),
+    },
+    "output": {
+        "record":           (None, str, "write a recording for replayEden.py to this file"),
+        "counts":           (None, str, "write the population counts after every timestep to this csv"),
+        "log":              (None, str, "write the garden's log to this file instead of the terminal"),
+    },
+    "behaviour": {
+        "ant_hunger":       (HUNGER[0], int, "timesteps an ant stays not hungry after eating a fossil"),
+        "butterfly_hunger": (HUNGER[1], int, "timesteps a butterfly stays not hungry after a flower"),
+        "rain_start":       (RAIN[0], int, "it rains after this timestep"),
+        "rain_end":         (RAIN[1], int, "and before this one"),
+        "worm_life_min":    (WORMLIFE[0], int, "shortest worm life in timesteps"),
+        "worm_life_max":    (WORMLIFE[1], int, "longest worm life in timesteps"),
+    },
+}
+
+
+def checkType(name, value, kind):                                               #value of a setting as kind, or ValueError
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError("setting " + name + " must be " + {int: "a whole number", float: "a number", str: "text", bool: "true or false"}[kind]
+                         + ", not " + repr(value))
+    return value
+
+def loadConfig(path):                                                           #{section: {setting: value}} of a TOML or JSON file
+    try:
+        if path.endswith(".json"):
+            with open(path, "r") as f:
+                found = json.load(f)
+        else:
+            with open(path, "rb") as f:
+                found = tomllib.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError("The configuration file can not be found. Please check the file path: " + path)
+    except (json.JSONDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(path + ": " + str(e))
+
+    if not isinstance(found, dict):
+        raise ValueError(path + ": not a configuration (sections " + ", ".join(OPTIONS) + ")")
+    config = {}
+    for section, settings in found.items():
+        if section not in OPTIONS or not isinstance(settings, dict):
+            raise ValueError(path + ": unknown section " + repr(section) + " (sections are " + ", ".join(OPTIONS) + ")")
+        config[section] = {}
+        for key, value in settings.items():
+            if key not in OPTIONS[section]:
+                raise ValueError(path + ": unknown setting " + section + "." + key)
+            default, kind, about = OPTIONS[section][key]
+            if value is not None or default is not None:                        #JSON null leaves a setting that has no default unset
+                value = checkType(section + "." + key, value, kind)
+            config[section][key] = value
+    return config
+
+
+def addOptions(parser):                                                         #a --flag for every setting (--render-every for render_every ...)
+    for section, settings in OPTIONS.items():
+        group = parser.add_argument_group(section)
+        for key, (default, kind, about) in settings.items():
+            flag = "--" + key.replace("_", "-")
+            if kind is bool:
+                group.add_argument(flag, dest=key, action=argparse.BooleanOptionalAction, default=None, help=about)
+            else:
+                if default is not None and "default" not in about:              #settings without a default (or that say it themselves) are left as they are
+                    about = about + " (default " + str(default) + ")"
+                group.add_argument(flag, dest=key, type=kind, default=None, help=about)
+
+def makeConfig(path=None, args=None):                                           #defaults, then the file at path, then the flags of addOptions() that were given
+    config = {section: {key: option[0] for key, option in settings.items()} for section, settings in OPTIONS.items()}
+    if path is not None:
+        for section, settings in loadConfig(path).items():
+            config[section].update(settings)
+    if args is not None:
+        for section, settings in OPTIONS.items():
+            for key in settings:
+                if getattr(args, key, None) is not None:
+                    config[section][key] = getattr(args, key)
+    checkConfig(config)
+    return config
+
+def checkConfig(config):                                                        #ValueError for the first setting that can not be played
+    run, render, behaviour = config["run"], config["render"], config["behaviour"]
+    if run["steps"] is not None and run["steps"] <= 0:
+        raise ValueError("run.steps must be above 0, not " + str(run["steps"]))
+    if run["sundial"] is not None:
+        run["sundial"] = run["sundial"].upper()
+        if run["sundial"] not in ("D", "N"):
+            raise ValueError("run.sundial must be 'D' or 'N', not " + repr(run["sundial"]))
+    if render["renderer"] not in RENDERERS:
+        raise ValueError("render.renderer must be one of " + ", ".join(RENDERERS) + ", not " + repr(render["renderer"]))
+    for key in ("render_every", "rate"):
+        if render[key] is not None and render[key] <= 0:
+            raise ValueError("render." + key + " must be above 0, not " + str(render[key]))
+    if render["pause"] < 0:
+        raise ValueError("render.pause can not be below 0")
+    if render["pipeline"] and (config["output"]["record"] or config["output"]["counts"]):
+        raise ValueError("output.record and output.counts need the garden in this process - they can not be used with render.pipeline")
+    for key in ("ant_hunger", "butterfly_hunger", "worm_life_min"):
+        if behaviour[key] <= 0:
+            raise ValueError("behaviour." + key + " must be above 0, not " + str(behaviour[key]))
+    if behaviour["rain_start"] >= behaviour["rain_end"]:
+        raise ValueError("behaviour.rain_start must be before behaviour.rain_end")
+    if behaviour["worm_life_min"] > behaviour["worm_life_max"]:
+        raise ValueError("behaviour.worm_life_min can not be above behaviour.worm_life_max")
+
+
+def applyBehaviour(behaviour):                                                  #the Garden keyword arguments of a behaviour section
+    return {"hunger": (behaviour["ant_hunger"], behaviour["butterfly_hunger"]), "rain": (behaviour["rain_start"], behaviour["rain_end"]),
+            "wormlife": (behaviour["worm_life_min"], behaviour["worm_life_max"])}
@@ -0,0 +1,446 @@
+# edenEngine.py
+# Headless simulation engine for the Eden ecosystem
+
+"""
+This module holds the timestep logic for the Eden Simulation, separated from
+the matplotlib window so that it can be driven by playEden.py, by worker
+processes or by benchmarks.
+
+A Garden owns the terrain and the lists of animals, food and rain. Each call
+to Garden.step() advances every phase once, in the same order as the original
+playEden loop:
+- Ants, Butterflies, Caterpillar, Lizards, Worms, Food, Rain
+
+The phases are also public methods so that other execution modes can run a
+subset of them (see edenParallel.py).
+
+Garden(..., sync=True) plays the ants and worms synchronously: every ant (or
+worm) chooses its move from the terrain as it was at the start of the phase
+(or of the ants' second move in the rain), two that move into the same cell
+are settled by claimWinners(), and the tunnels (or worm tails) are then dug
+in one batch with setCells(). Every animal (butterflies, caterpillars and
+lizards too) takes its random moves from its own stream, random.Random keyed
+on (seed, timestep, name) - see animalRandom(); Garden(..., seed=...) or a
+seed drawn from the random module. So neither the terrain they leave nor where
+they are depends on the order of the animal lists, and the moves can be
+worked out in bulk or by separate workers.
+
+Garden(..., hunger=(20, 15), rain=(35, 50), wormlife=(12, 30)) sets how many
+timesteps ants and butterflies stay not hungry after eating, when it rains
+and how long worms live (HUNGER, RAIN and WORMLIFE by default) - every worm
+draws its own life from the range, and one is born for every worm that dies,
+so the ground keeps as many worms as it started with (at least one). The
+hunger is kept by every ant and butterfly the garden makes (fullfor), so two
+gardens with different settings can play side by side. edenConfig.py sets
+them all from a run configuration.
+"""
+
+
+import numpy as np
+import random
+
+from Eden import *
+from edenFields import DistanceField, isFlower, isFossil
+from edenLifecycle import Lifecycle, spawnSite
+from edenMoves import flatIndex, makeTables, padTerrain
+from edenPopulation import SPECIES
+
+
+def claimWinners(animals, before):
+    #animals that moved into the same cell: the one that came from the lowest (row, col), then the lowest name, gets it - returns the winners
+    claims = {}
+    for animal, old in zip(animals, before):
+        if animal.pos != old:
+            key = (old, animal.name)
+            claim = claims.get(animal.pos)
+            if claim is None or key < claim[0]:
+                claims[animal.pos] = (key, animal)
+    return {animal for key, animal in claims.values()}
+
+
+HUNGER = (20, 15)                                                               #timesteps ants and butterflies stay not hungry after eating
+RAIN = (35, 50)                                                                 #it rains after the first timestep and before the second
+WORMLIFE = (12, 30)                                                             #worms live (the tail grows) between these numbers of timesteps
+
+PHASES = ("stepAnts", "stepButterflies", "stepCaterpillar", "stepLizards", "stepWorms", "stepFood", "stepRain")     #Garden.step() order
+
+
+class Garden:
+
+    def __init__(self, terrain=None, critters=(), LIMITS=None, padded=None, sync=False, hunger=HUNGER, rain=RAIN, wormlife=WORMLIFE, seed=None):
+        #terrain is copied into a new padded terrain; pass padded (edenMoves.padTerrain layout) instead to use it in place, e.g. a shared terrain
+        if padded is None:
+            padded = padTerrain(terrain)
+        self.padded = padded                                            #terrain with a SENTINEL border (edenMoves.py)
+        self.terrain = padded[1:-1, 1:-1]                               #the terrain itself - a view, so writes go to padded
+        self.cells = memoryview(padded.reshape(-1))                     #the same terrain, flat, for reading and writing single cells
+        self.width = padded.shape[1]
+        if LIMITS is None:
+            LIMITS = np.array(self.terrain)
+        self.LIMITS = LIMITS                                            #untouched base terrain (can be a shared read-only view)
+        self.tables = makeTables(padded)                                #move tables for every species (edenMoves.py) - change terrain with setCell/refreshCells
+        self.fossilfield = DistanceField(self.tables["ant"], padded, isFossil)          #moves to the nearest fossil (edenFields.py) - repaired by setCell/refreshCells
+        self.flowerfield = DistanceField(self.tables["butterfly"], padded, isFlower)    #moves to the nearest flower - repaired too, worm tails open the butterflies' way
+        self.changed = None                                             #set to a list to collect every (row, col) the terrain changes at
+        self.sync = sync                                                #ants and worms read the terrain as it was and write it all at once
+        if sync and seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed                                                #sync: the animals' own random streams come from it (animalRandom)
+
+        #lists of animals
+        self.ants = []
+        self.bflys = []
+        self.lizzys = []
+        self.worms = []
+        self.lifecycle = Lifecycle(spawn=spawnSite(self.terrain))       #caterpillars and cocoons, each with its own stage and timer (edenLifecycle.py)
+        self.lifeevents = []                                            #(name, stage) for every lifecycle stage change of the last timestep
+
+        self.anthunger, self.bflyhunger = hunger                        #fullfor of the ants and butterflies made here
+
+        #lists of food locations
+        self.flowerpos = []
+        self.fossilpos = []
+        self.fossilpool = []                                            #Fossil objects reused every timestep (fossil FFn is always fossilpool[n])
+        self.fossilat = {}                                              #fossilpos by position
+
+        #worms: each draws its length of life before dying of old age from wormlife
+        self.wormlife = wormlife
+        self.wormcount = 1                                              #worms kept alive - as many as the garden started with
+        rows, cols = self.terrain.shape                                 #new worms are born in this box (first row, rows, first col, cols) -
+        self.wormbirth = (35*rows//59, 15*rows//59, 10*cols//112, 90*cols//112)     #the ground of worldscene.csv, scaled to the terrain
+
+        #dead critters
+        self.wormtofossil = []                                          #tail cells of the last worm that died (now fossils)
+
+        #rain
+        self.rain = []
+        self.raindance = False
+        self.rainwindow = rain                                          #(after timestep, before timestep) of the rain
+        self.allflooded = []                                            #every cell the rain has flooded, once each and in order
+        self.floodedset = set()
+        self.rain_r, self.rain_c, self.rain_r2, self.rain_c2 = [], [], [], []
+
+        #counts
+        self.t = 0                                                      #timesteps played (also used for the plot title)
+        self.originalbflys = 0                                          #to make sure caterpillars replenish butterflies when they die
+
+    #FOOD
+        #flowers    #(6.1)
+        flower_rows, flower_cols = np.where(self.terrain == 0.745)
+        self.flowerpos = [Flower("F"+str(i), (row,col)) for i, (row,col) in enumerate(zip(flower_rows.tolist(), flower_cols.tolist()))]
+
+    #ANIMALS
+        if len(critters) > 0:
+            self.addCritters(critters)
+            self.originalbflys = len(self.bflys)
+            self.wormcount = max(len(self.worms), 1)
+
+    #Rain
+        rain_rows, rain_cols = np.where((self.terrain > 0.36) | (self.terrain == 0.27))
+        self.rain = [Raining("R"+str(r), (row,col), False) for r, (row,col) in enumerate(zip(rain_rows.tolist(), rain_cols.tolist()))]    #preloading the rain
+
+    def addCritters(self, critters, announce=True):
+        #bulk create animals from a critter array (edenPopulation.CRITTER_DTYPE) straight into the animal lists
+        for code, species in enumerate(SPECIES):
+            group = critters[critters["species"] == code]
+            if len(group) == 0:
+                continue
+            names = group["name"].astype(str).tolist()
+            rows = group["row"].tolist()
+            cols = group["col"].tolist()
+            status = ["alive" if alive else "dead" for alive in group["alive"].tolist()]
+            hungry = group["hungry"].tolist()
+
+            if species == "Ant":
+                born = [Ant(*critter, self.fossilpos, self.anthunger) for critter in zip(names, rows, cols, status, hungry)]
+                self.ants.extend(born)
+            elif species == "Butterfly":
+                colours = group["colour"].astype(str).tolist()
+                born = [Butterfly(*critter, self.flowerpos, self.bflyhunger) for critter in zip(names, rows, cols, colours, status, hungry)]
+                self.bflys.extend(born)
+            elif species == "Lizard":
+                born = [Lizard(*critter) for critter in zip(names, rows, cols, status, hungry)]
+                self.lizzys.extend(born)
+            else:
+                born = [Worm(*critter, random.randint(*self.wormlife)) for critter in zip(names, rows, cols, status, hungry)]
+                self.worms.extend(born)
+
+            if announce:
+                for critter in born:
+                    critter.printit()                                   #All Hail the Queen, Oooo Pretty flowers, Slurp slurp, Hello! I'm Dr Worm
+
+    @property
+    def catp(self):                                                     #caterpillars and cocoons
+        return self.lifecycle.catp
+
+    @property
+    def finalcatp(self):                                                #caterpillars ever hatched
+        return self.lifecycle.hatched
+
+    def setCell(self, row, col, value):                                 #change one terrain cell and the move tables that see it
+        cell = (row+1)*self.width + col + 1
+        old = self.cells[cell]
+        if old != value:
+            self.cells[cell] = value
+            for table in self.tables.values():
+                table.refreshCell(cell, old, value)
+            self.fossilfield.refreshCell(cell, old, value)
+            self.flowerfield.refreshCell(cell, old, value)
+            if self.changed is not None:
+                self.changed.append((row, col))
+
+    def refreshCells(self, rows, cols):                                 #terrain already changed at many cells (arrays of rows and cols)
+        if len(rows) == 0:
+            return
+        cells = flatIndex((np.asarray(rows), np.asarray(cols)), self.width)
+        flat = self.padded.reshape(-1)
+        for table in self.tables.values():
+            table.refreshCells(flat, cells)
+        self.fossilfield.refreshCells(cells)
+        self.flowerfield.refreshCells(cells)
+        if self.changed is not None:
+            self.changed.extend(zip(np.asarray(rows).tolist(), np.asarray(cols).tolist()))
+
+    def setCells(self, rows, cols, value):                              #change many terrain cells to one value in one batch
+        if len(rows) == 0:
+            return
+        cells = np.unique(flatIndex((np.asarray(rows), np.asarray(cols)), self.width))
+        flat = self.padded.reshape(-1)
+        cells = cells[flat[cells] != value]
+        flat[cells] = value
+        rows, cols = np.divmod(cells, self.width)
+        self.refreshCells(rows - 1, cols - 1)
+
+    def step(self):
+        self.stepAnts()
+        self.stepButterflies()
+        self.stepCaterpillar()
+        self.stepLizards()
+        self.stepWorms()
+        self.stepFood()
+        self.stepRain()
+        self.t = self.t + 1
+
+    def animalRandom(self, animal):                                     #sync: the random stream of one animal this timestep
+        return random.Random(str(self.seed) + ":" + str(self.t) + ":" + animal.name)
+
+    def counts(self):
+        return {"fossils": len(self.fossilpos), "butterflies": len(self.bflys), "caterpillars": len(self.catp),
+                "ants": len(self.ants), "lizards": len(self.lizzys), "worms": len(self.worms), "flowers": len(self.flowerpos)}
+
+#ANTS #(5.2)
+    def stepAnts(self):
+        if self.sync:
+            return self.stepAntsSync()
+        table = self.tables["ant"]
+        for ant in self.ants:
+            ant.stepChange(table.options(ant.getPos()), self.fossilpos, self.fossilfield)
+            tunnel_row, tunnel_col = ant.getPos()                              #ant position changes terrain to 0.1 to show tunnel dug to user
+            self.setCell(tunnel_row, tunnel_col, 0.1)
+            if self.raindance == True:                                          #if raining, ants move twice as fast
+                ant.stepChange(table.options(ant.getPos()), self.fossilpos, self.fossilfield)
+                tunnel_row, tunnel_col = ant.getPos()
+                self.setCell(tunnel_row, tunnel_col, 0.1)
+
+            fossil = self.fossilat.get(ant.getPos())                            #if ant is ontop of fossil, fossil is eaten and disappears
+            if fossil is not None:
+                print("Ant", ant.name, "ate Fossil:", fossil.name, "!")
+                fosrow, foscol = ant.getPos()
+                self.setCell(fosrow, foscol, 0.1)
+
+    def stepAntsSync(self):                                                     #every ant moves from the same terrain, then all tunnels are dug at once
+        table = self.tables["ant"]
+        streams = [self.animalRandom(ant) for ant in self.ants]                 #one stream for both moves in the rain
+        for move in range(2 if self.raindance else 1):                          #if raining, ants move twice as fast
+            before = [(ant.pos, ant.hungry, ant.time_since_fossil) for ant in self.ants]
+            for ant, rng in zip(self.ants, streams):
+                ant.stepChange(table.options(ant.getPos()), self.fossilpos, self.fossilfield, rng)
+            winners = claimWinners(self.ants, [old[0] for old in before])
+            for ant, old in zip(self.ants, before):
+                if ant.pos != old[0] and ant not in winners:                    #another ant got the cell - stays where it was (and ate nothing)
+                    ant.pos, ant.hungry, ant.time_since_fossil = old
+                    ant.tick()
+            self.setCells([ant.pos[0] for ant in self.ants], [ant.pos[1] for ant in self.ants], 0.1)    #tunnels dug (and fossils eaten) all at once
+
+        eaten = {}
+        for ant in self.ants:                                                   #a fossil shared by ants is eaten by the lowest name
+            fossil = self.fossilat.get(ant.getPos())
+            if fossil is not None and (fossil not in eaten or ant.name < eaten[fossil].name):
+                eaten[fossil] = ant
+        for fossil, ant in sorted(eaten.items(), key=lambda item: item[1].name):
+            print("Ant", ant.name, "ate Fossil:", fossil.name, "!")
+
+#BUTTERFLIES     #(5.3)
+    def stepButterflies(self, lizzys=None):
+        if lizzys is None:                                                      #lizards anywhere in eden (a strip worker passes them all in)
+            lizzys = self.lizzys
+        if self.raindance == True:                                              #butterflies only drop down in the rain
+            table = self.tables["butterflyrain"]
+        else:
+            table = self.tables["butterfly"]
+        for bfly in self.bflys:
+            bfly.stepChange(table.options(bfly.getPos()), self.flowerpos, self.raindance, self.flowerfield,   #butterfly sends rain status to class through StepChange
+                            self.animalRandom(bfly) if self.sync else random)
+
+            #butterflies eaten by lizards if they are ontop or next to lizards tongue
+            for lizzy in lizzys:
+                if bfly.getPos() == lizzy.getPos():                             #lizards eat butterflys that are right on top of them
+                    bfly.butterdeath(lizzy.name)
+
+            for lizzy in lizzys:
+                if bfly.getPos() == lizzy.inReach():                            #lizards eat butterflys that are in reach of their tongue (1 row higher)
+                    bfly.butterdeath(lizzy.name)
+
+#CATERPILLAR    #(5.4)
+    def stepCaterpillar(self, bcount=None):
+        if bcount is None:                                                      #butterflies anywhere in eden (the parallel coordinator passes the total in)
+            bcount = len(self.bflys)
+        life = self.lifecycle
+        events, cocoons = life.advance()                                        #every caterpillar and cocoon one timestep older
+
+        #a butterfly comes out of every cocoon that is done
+        babybflys = [Butterfly(c.name, c.pos[0], c.pos[1], "black", "alive", True, self.flowerpos, self.bflyhunger) for c in cocoons]   #made black colour to track new born butterflies from existing
+
+        #one caterpillar for every butterfly missing that is not already on its way
+        missing = self.originalbflys - bcount - len(life) - len(babybflys)
+        hatched = life.hatch(missing)
+        events.extend(hatched)
+
+        table = self.tables["caterpillar"]
+        for c in life.movers():                                                 #caterpillars move in the tree (new ones too), cocoons hang still
+            c.stepChange(table.options(c.getPos()), self.animalRandom(c) if self.sync else random)
+
+        for name, stage in events:
+            if stage == "cocoon":
+                print("\nCATERPILLAR", name, "HAS TURNED INTO COCOON")
+                print("\t\"shhhh Caterpillar baby is sleeping...zz.zzz.zzz\"")
+            elif stage == "butterfly":
+                print("\nCATERPILLAR", name, "HAS TURNED INTO BUTTERFLY!")
+                print("\t\"Hear me ROAR!\"")
+        for c in life.catp[len(life)-len(hatched):]:
+            c.printit()                                                         #announce arrival
+        for bfly in babybflys:
+            bfly.printit()
+        self.lifeevents = events
+
+        #butterflies not eaten (still set to "alive") and new born butterflies are now the entire bfly list
+        self.bflys = [bfly for bfly in self.bflys if bfly.status == "alive"]
+        self.bflys.extend(babybflys)
+
+#LIZARDS        #(5.4)
+    def stepLizards(self):
+        table = self.tables["lizard"]
+        for lizzy in self.lizzys:
+            lizzy.stepChange(table.options(lizzy.getPos()), self.animalRandom(lizzy) if self.sync else random)
+
+#WORMS      #(5.5)
+    def stepWorms(self):
+        if self.sync:
+            self.stepWormsSync()
+        else:
+            dead = []
+            for i in range(len(self.worms)):
+                worm = self.worms[i]
+                worm.stepChange(self.tables["worm"].options(worm.getPos()))
+                worm.storeoldtail()                                             #worm class store location of current position into old tail list
+
+                tail_row, tail_col = worm.getPos()                              #stops worm from touching itself, stops ants from building tunnels through worm
+                self.setCell(tail_row, tail_col, 0.7)                           #worms change terrain to 0.7
+
+                #deathmarch of the worm
+                if len(worm.oldtail) >= worm.lifespan:                          #at its own random time, checked against tail length (age)
+                    dead.append(i)
+            for i in reversed(dead):                                            #every worm has moved - the old ones die (from the back, so the indices hold)
+                self.wormDeath(i)
+
+        #birth of new worms, one for every worm that died
+        row, rows, col, cols = self.wormbirth
+        for n in range(self.wormcount - len(self.worms)):
+            name = "W"+str(self.t)+"."+str(n+1)                                 #unique, and unlike W1, W2... of a scenario (sync mode keys the worm's moves on it)
+            self.worms.append(Worm(name, row+random.randint(0,rows), col+random.randint(0,cols), "alive", False, random.randint(*self.wormlife)))
+            self.worms[-1].printit()
+
+    def stepWormsSync(self):                                                    #every worm moves from the same terrain, then all tails are laid at once
+        before = [worm.pos for worm in self.worms]
+        for worm in self.worms:
+            worm.stepChange(self.tables["worm"].options(worm.getPos()), self.animalRandom(worm))
+        winners = claimWinners(self.worms, before)
+        for worm, old in zip(self.worms, before):
+            if worm.pos != old and worm not in winners:                         #another worm got the cell - stays where it was
+                worm.pos = old
+            worm.storeoldtail()
+        self.setCells([worm.pos[0] for worm in self.worms], [worm.pos[1] for worm in self.worms], 0.7)
+
+        dead = [i for i, worm in enumerate(self.worms) if len(worm.oldtail) >= worm.lifespan]        #deathmarch of the worm
+        for i in reversed(dead):
+            self.wormDeath(i)
+
+    def wormDeath(self, i):                                                     #worm i dies and its tail becomes fossils
+        terrain = self.terrain
+        worm = self.worms[i]
+        tail = np.unique(np.ravel_multi_index(np.array(worm.oldtail, dtype=np.intp).reshape(-1, 2).T, terrain.shape))   #where worm has been
+        tail_rows, tail_cols = np.unravel_index(tail, terrain.shape)
+        tail = terrain[tail_rows, tail_cols] == 0.7
+        tail_rows, tail_cols = tail_rows[tail], tail_cols[tail]
+        self.wormtofossil = list(zip(tail_rows.tolist(), tail_cols.tolist()))
+
+        terrain[tail_rows, tail_cols] = 0.21                                    #makes old worm terrain 0.7 into fossil ground (Fossils taken from the pool at end of timestep)
+        self.refreshCells(tail_rows, tail_cols)
+    #Remove dead worm
+        worm.wormdeath()                                                        #wormdeath clears oldtail list, changes status to dead and notifys user
+        self.worms.pop(i)
+
+#FOOD          (#6)
+    def stepFood(self):
+        fossil_rows, fossil_cols = np.where(self.terrain == 0.21)              #(6.2)
+        pool = self.fossilpool
+        for f in range(len(pool), len(fossil_rows)):                           #only make new Fossils when there are more fossils than ever before
+            pool.append(Fossil("FF"+str(f), None))
+        for fossil, row, col in zip(pool, fossil_rows.tolist(), fossil_cols.tolist()):
+            fossil.pos = (row, col)
+        self.fossilpos = pool[:len(fossil_rows)]
+        self.fossilat = {fossil.pos: fossil for fossil in self.fossilpos}
+
+#RAIN (event)           #(7.1)
+    def stepRain(self):
+        self.rain_r, self.rain_c, self.rain_r2, self.rain_c2 = [], [], [], []
+
+        if self.rainwindow[0] < self.t < self.rainwindow[1]:                    #select time (between timestep * and timestep *)
+
+            print("MA! THE RAINS ARE HERE!")                                    #each timestep it rains
+            self.raindance = True
+            for drop in self.rain[::2]:                                         #every second raindrop in rain list
+                drop.status = "on"
+                self.rain_r.append(drop.getPos()[1])                            #plot position row
+                self.rain_c.append(drop.getPos()[0])                            #plot position col
+
+            for drop in self.rain[1::2]:                                        #every other raindrop in rain list
+                drop.status = "on"
+                self.rain_r2.append(drop.getPos()[1])
+                self.rain_c2.append(drop.getPos()[0])
+
+        else:
+            for drop in self.rain:                                              #not raining
+                drop.status = "off"
+            self.raindance = False
+
+        if self.raindance == True:                                              #flood the top row of tunnels
+            terrain = self.terrain
+            floodrow = None
+            flooded = []
+
+            for row in range(len(terrain)):
+                for col in range(len(terrain[row])):
+                    if terrain[row][col] == 0.1:
+                        if floodrow is None:
+                            floodrow = row
+                        if row == floodrow:
+                            terrain[row][col] = 0.2
+                            flooded.append((row,col))
+
+            if flooded:
+                self.refreshCells(*zip(*flooded))
+            for cell in flooded:                                                #a cell dug again and flooded again is only kept once
+                if cell not in self.floodedset:
+                    self.floodedset.add(cell)
+                    self.allflooded.append(cell)
@@ -0,0 +1,132 @@
+# edenFields.py
+# Distance fields that lead hungry animals to food
+
+"""
+A DistanceField holds, for every terrain cell, how many moves an animal of one
+species needs to reach the nearest food cell without leaving the cells it may
+enter (its move table mask, see edenMoves.py). It is a multi-source
+breadth-first search started from every food cell at once.
+
+A hungry animal does not search for food any more - it takes the first legal
+move that leads to a cell one step closer (downhill), a constant time lookup,
+and it walks round worm bodies and rocks instead of bumping into them.
+
+- Fossils are eaten by ants and laid by dying worms, and worms block the ants'
+  way. Flowers never move, but a worm tail (0.7) is a cell butterflies may
+  enter. So both fields are repaired whenever a cell changes: cells whose
+  every shortest path went through the changed cell are cleared and filled in
+  again from their neighbours, and a new food or open cell is spread outward.
+  Only the cells whose distance really changes are touched.
+"""
+
+
+import heapq
+import numpy as np
+
+
+UNREACHED = np.iinfo(np.int32).max                                              #distance of cells that cannot reach any food
+
+def isFossil(v):
+    return v == 0.21
+
+def isFlower(v):
+    return v == 0.745
+
+
+class DistanceField:
+
+    def __init__(self, table, padded, isfood):
+        self.table = table                                                      #MoveTable of the species that eats the food
+        self.isfood = isfood
+        self.width = table.width
+        self.offsets = table.offsets.tolist()
+        self.dist = np.full(padded.size, UNREACHED, dtype=np.int32)
+        self.lookup = memoryview(self.dist)                                     #the same distances, for reading single cells
+        self.cells = memoryview(padded.reshape(-1))                             #the terrain, flat
+        self.rebuild(padded.reshape(-1))
+
+    def rebuild(self, flat):                                                    #breadth-first search from every food cell, one ring per pass
+        mask = self.table.mask
+        dist = self.dist
+        dist.fill(UNREACHED)
+        ring = np.flatnonzero(self.isfood(flat) & mask)
+        dist[ring] = 0
+        d = 0
+        while len(ring) > 0:
+            d = d + 1
+            reach = (ring[:, None] - self.table.offsets).ravel()                #cells that step into the ring
+            reach = np.unique(reach[mask[reach] & (dist[reach] == UNREACHED)])
+            dist[reach] = d
+            ring = reach
+
+    def at(self, pos):
+        return self.lookup[(pos[0]+1)*self.width + pos[1] + 1]
+
+    def downhill(self, pos, moves):                                             #first legal move one step closer to food (None if there is none)
+        cell = (pos[0]+1)*self.width + pos[1] + 1
+        lookup = self.lookup
+        closer = lookup[cell] - 1
+        if closer < 0 or closer == UNREACHED - 1:
+            return None
+        for move in moves:
+            if lookup[cell + move[0]*self.width + move[1]] == closer:
+                return move
+        return None
+
+    def refreshCell(self, cell, old, new):                                      #one cell (flat index) changed from old to new terrain
+        passable = self.table.passable
+        if self.isfood(old) != self.isfood(new) or bool(passable(old)) != bool(passable(new)):
+            self.repair((cell,))
+
+    def refreshCells(self, cells):                                              #terrain already changed at many cells (flat indices)
+        self.repair(np.unique(cells).tolist())
+
+    def repair(self, cells):
+        lookup = self.lookup
+        terrain = self.cells
+        mask = self.table.mask
+        offsets = self.offsets
+
+        def settle(c):                                                          #distance of c from its neighbours
+            if not mask[c]:
+                return UNREACHED
+            if self.isfood(terrain[c]):
+                return 0
+            best = min(lookup[c + offset] for offset in offsets)
+            return UNREACHED if best == UNREACHED else best + 1
+
+        #cells that got further from food: clear them and every cell that only led down through them
+        #(taken nearest first, so every cleared cell one ring closer is known before a cell is checked)
+        heap = [(lookup[c], c) for c in cells if lookup[c] != UNREACHED and settle(c) > lookup[c]]
+        raised = {c for d, c in heap}
+        heapq.heapify(heap)
+        cleared = []
+        while heap:
+            d, x = heapq.heappop(heap)
+            for offset in offsets:
+                y = x - offset
+                if y in raised or lookup[y] != d + 1:
+                    continue
+                if all(lookup[y + o] != d or y + o in raised for o in offsets):   #no other way down from y
+                    raised.add(y)
+                    heapq.heappush(heap, (d + 1, y))
+            cleared.append(x)
+        for x in cleared:
+            lookup[x] = UNREACHED
+
+        #fill them back in, and spread out from every cell that got closer to food
+        for c in cleared + list(cells):
+            d = settle(c)
+            if d < lookup[c]:
+                lookup[c] = d
+                heap.append((d, c))
+        heapq.heapify(heap)
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d != lookup[x]:
+                continue
+            for offset in offsets:
+                y = x - offset
+                if d + 1 < lookup[y] and mask[y]:
+                    lookup[y] = d + 1
+                    heapq.heappush(heap, (d + 1, y))
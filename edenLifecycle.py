@@ -0,0 +1,108 @@
+# edenLifecycle.py
+# Caterpillar -> cocoon -> butterfly lifecycle for any number of caterpillars
+
+"""
+The lifecycle is a table of stages, each lasting a number of timesteps:
+
+    caterpillar   9 timesteps   moves along the tree
+    cocoon        6 timesteps   hangs where the caterpillar stopped
+    butterfly                   born - joins the butterflies
+
+Every caterpillar carries its own stage and timer. They are kept in two
+arrays (one entry per caterpillar, in the order of Lifecycle.catp) and
+advanced for all caterpillars at once: one timer increment, one comparison
+against the stage durations and one stage increment for those that are done.
+
+Each stage change is an event (name, stage), so the garden can announce it
+and other code can follow it (Garden.lifeevents). Caterpillars are hatched
+in bulk, and the butterflies that come out of their cocoons in the same
+timestep are handed back together.
+
+A caterpillar hatched in a timestep already moves in that timestep.
+
+Caterpillars hatch on the tree branch of worldscene.csv (SPAWN). In a world
+where that spot is not on a tree (edenWorld.py makes worlds of any size),
+spawnSite() picks the top of the first tree instead.
+"""
+
+
+import numpy as np
+import random
+
+from Eden import Caterpillar
+
+
+#(stage, timesteps spent in it, moves along the tree) - in order; a butterfly is born after the last one
+LIFECYCLE = (
+    ("caterpillar", 9, True),
+    ("cocoon", 6, False),
+)
+SPAWN = (14, 50, 54)                                                            #caterpillars hatch on the tree at this row, between these columns
+
+
+def spawnSite(terrain, spawn=SPAWN):                                            #spawn if it is on a tree, or else the top of the first tree (None without trees)
+    row, first, last = spawn
+    rows, cols = np.shape(terrain)
+    if row < rows and last < cols and np.all((terrain[row, first:last+1] >= 0.25) & (terrain[row, first:last+1] < 0.8)):
+        return spawn
+    trees = np.flatnonzero((terrain >= 0.25) & (terrain <= 0.27))
+    if len(trees) == 0:
+        return None
+    row, first = divmod(int(trees[0]), cols)
+    last = first
+    while last + 1 < cols and 0.25 <= terrain[row, last+1] <= 0.27:
+        last = last + 1
+    return (row, first, last)
+
+
+class Lifecycle:
+
+    def __init__(self, table=LIFECYCLE, spawn=SPAWN):
+        self.stages = tuple(stage for stage, steps, moves in table) + ("butterfly",)
+        self.duration = np.array([steps for stage, steps, moves in table], dtype=np.int16)
+        self.moving = np.array([moves for stage, steps, moves in table], dtype=bool)
+        self.spawn = spawn                                                      #(row, first col, last col) or None for no caterpillars
+        self.catp = []                                                          #Caterpillar objects (caterpillars and cocoons)
+        self.stage = np.zeros(0, dtype=np.int8)                                 #stage of each one, index into self.stages
+        self.timer = np.zeros(0, dtype=np.int16)                                #timesteps each one has spent in its stage
+        self.hatched = 0                                                        #caterpillars ever hatched
+
+    def __len__(self):
+        return len(self.catp)
+
+    def hatch(self, n):                                                         #n new caterpillars on the spawn tree, returns their events
+        if n <= 0 or self.spawn is None:
+            return []
+        row, first, last = self.spawn
+        born = [Caterpillar("C"+str(self.hatched + i + 1), row, random.randint(first, last), "alive", self.stages[0]) for i in range(n)]
+        self.catp.extend(born)
+        self.stage = np.concatenate((self.stage, np.zeros(n, dtype=np.int8)))
+        self.timer = np.concatenate((self.timer, np.zeros(n, dtype=np.int16)))
+        self.hatched = self.hatched + n
+        return [(c.name, self.stages[0]) for c in born]
+
+    def advance(self):                                                          #one timestep for every caterpillar, returns (events, cocoons a butterfly came out of)
+        if len(self.catp) == 0:
+            return [], []
+        self.timer += 1
+        done = np.flatnonzero(self.timer >= self.duration[self.stage])
+        self.stage[done] += 1
+        self.timer[done] = 0
+
+        events = []
+        for i in done.tolist():
+            c = self.catp[i]
+            c.stage = self.stages[self.stage[i]]
+            events.append((c.name, c.stage))
+
+        emerged = self.stage == len(self.duration)
+        if not emerged.any():
+            return events, []
+        cocoons = [c for c, out in zip(self.catp, emerged.tolist()) if out]
+        self.catp = [c for c, out in zip(self.catp, emerged.tolist()) if not out]
+        self.stage = self.stage[~emerged]
+        self.timer = self.timer[~emerged]
+        return events, cocoons
+
+    def movers(self):                                                           #caterpillars in a stage that moves
+        return [self.catp[i] for i in np.flatnonzero(self.moving[self.stage]).tolist()]
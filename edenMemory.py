@@ -0,0 +1,90 @@
+# edenMemory.py
+# Memory accounting for the Eden engine
+
+"""
+Where does a Garden's memory go, and which phase allocates it?
+
+footprint(garden) measures the structures of every subsystem (SUBSYSTEMS) -
+objects, lists, dicts and numpy arrays, followed all the way down. Anything
+shared between subsystems is counted once, under the first one that reaches
+it (the Butterflies' flower list is counted under food, for example).
+
+stepTraced(garden) plays one timestep like Garden.step(), taking a
+tracemalloc snapshot after every phase. Comparing each snapshot with the one
+before it gives the memory each phase kept, and the line that kept the most.
+tracemalloc must already be tracing.
+
+benchEden.py flat uses both every --every timesteps to show that a long
+headless run stays flat.
+"""
+
+
+import sys
+import tracemalloc
+import types
+import numpy as np
+
+from edenEngine import PHASES
+
+
+#subsystem -> the structures of a garden it owns (in this order, see footprint())
+SUBSYSTEMS = {
+    "terrain":      lambda garden: (garden.padded, garden.LIMITS, garden.cells, garden.changed),
+    "moves":        lambda garden: garden.tables,
+    "fields":       lambda garden: (garden.fossilfield, garden.flowerfield),
+    "food":         lambda garden: (garden.flowerpos, garden.fossilpos, garden.fossilpool, garden.fossilat),
+    "ants":         lambda garden: garden.ants,
+    "butterflies":  lambda garden: garden.bflys,
+    "caterpillars": lambda garden: (garden.lifecycle, garden.lifeevents),
+    "lizards":      lambda garden: garden.lizzys,
+    "worms":        lambda garden: (garden.worms, garden.wormtofossil),
+    "rain":         lambda garden: (garden.rain, garden.allflooded, garden.floodedset, garden.rain_r, garden.rain_c, garden.rain_r2, garden.rain_c2),
+}
+
+SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def sizeOf(obj, seen):                                                          #bytes of obj and everything it holds that is not in seen (a dict) yet
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SKIP):
+            continue
+        seen[id(obj)] = obj                                                     #kept, so that its id is not reused by a later object
+        size = size + sys.getsizeof(obj)
+        if isinstance(obj, np.ndarray):
+            if obj.base is None:                                                #a view is counted with the array it looks at
+                size = size + obj.nbytes
+            else:
+                stack.append(obj.base)
+        elif isinstance(obj, memoryview):
+            stack.append(obj.obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+            stack.extend(getattr(obj, name) for cls in type(obj).__mro__ for name in getattr(cls, "__slots__", ()) if hasattr(obj, name))
+            stack.extend(getattr(obj, "__dict__", {}).values())
+    return size
+
+def footprint(garden):                                                          #{subsystem: bytes}
+    seen = {}
+    return {name: sizeOf(structures(garden), seen) for name, structures in SUBSYSTEMS.items()}
+
+
+def stepTraced(garden):                                                         #one timestep, returns {phase: (bytes kept, tracemalloc statistic of the line that kept the most)}
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    kept = {}
+    before = tracemalloc.take_snapshot().filter_traces(ignore)
+    for phase in PHASES:
+        getattr(garden, phase)()
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        stats = after.compare_to(before, "lineno")
+        top = max(stats, key=lambda stat: stat.size_diff, default=None)
+        kept[phase] = (sum(stat.size_diff for stat in stats), top)
+        before = after
+    garden.t = garden.t + 1
+    return kept
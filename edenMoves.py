@@ -0,0 +1,110 @@
+# edenMoves.py
+# Precomputed neighbourhood move tables for every species
+
+"""
+Every animal moves to one of a fixed set of neighbouring cells (its
+neighbourhood) and may only enter cells whose terrain suits its species.
+Instead of testing the 3x3 subgrid around an animal every timestep, a
+MoveTable keeps, for the whole terrain:
+- mask: whether each cell is passable for the species
+- bits: a neighbour bitmask per cell, bit j set when move j leads to a
+  passable cell
+
+choices[bits] is the tuple of legal moves for a bitmask, built once, so the
+legal moves of an animal are a table lookup and picking one is a single
+random index. When the terrain changes only the changed cells and the cells
+next to them are refreshed.
+
+The terrain is stored padded (padTerrain): one extra cell all the way round,
+holding SENTINEL (NaN), which no species can enter because every comparison
+with NaN is False. So no neighbourhood ever falls off the edge of the map, and
+neighbours are reached by flat offsets (dr*width + dc) into the padded array
+rather than by slicing a subgrid for every animal.
+"""
+
+
+import numpy as np
+
+
+SENTINEL = np.nan                                                               #border value round the padded terrain - passable for nobody
+
+#(moves in the order the animals try them, terrain the species may enter)
+ANT_MOVES = ((-1,0), (0,-1), (0,1), (1,0))                                      #von Nuemann
+MOORE_MOVES = ((-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1))    #Moore
+RAIN_MOVES = ((1,1), (1,0), (0,0), (1,-1))                                      #butterflies in the rain - only down movements and not moving
+BRANCH_MOVES = ((0,-1), (0,1))                                                  #caterpillars only move left and right
+SLUG_MOVES = ((-1,0), (0,-1), (0,0), (0,1), (1,0))                              #worms - von Nuemann or stay put
+
+SPECIES_MOVES = {
+    "ant":           (ANT_MOVES,    lambda v: (0 < v) & (v < 0.22)),            #ground, fossils or tunnel
+    "butterfly":     (MOORE_MOVES,  lambda v: v > 0.35),                        #not ground, rocks, tunnels or clouds
+    "butterflyrain": (RAIN_MOVES,   lambda v: v > 0.35),
+    "caterpillar":   (BRANCH_MOVES, lambda v: v < 0.8),                         #on the tree, not the sky
+    "lizard":        (MOORE_MOVES,  lambda v: (0.24 < v) & (v < 0.79)),         #grass, rocks or trees
+    "worm":          (SLUG_MOVES,   lambda v: (0 < v) & (v < 0.21)),            #ground or tunnel, not its old tail (0.7) or fossils
+}
+
+
+def padTerrain(terrain):                                                        #terrain -> new padded array with a SENTINEL border
+    rows, cols = np.shape(terrain)
+    padded = np.full((rows+2, cols+2), SENTINEL)
+    padded[1:-1, 1:-1] = terrain
+    return padded
+
+def flatIndex(pos, width):                                                      #(row, col) of the terrain -> index into the flattened padded terrain
+    return (pos[0]+1)*width + pos[1] + 1
+
+def innerCells(padded):                                                         #flat index of every terrain (not border) cell of a padded terrain
+    rows, cols = np.indices((padded.shape[0]-2, padded.shape[1]-2))
+    return flatIndex((rows.ravel(), cols.ravel()), padded.shape[1])
+
+
+class MoveTable:
+
+    def __init__(self, padded, moves, passable, inner=None):
+        self.moves = moves
+        self.passable = passable
+        self.width = padded.shape[1]
+        self.offsets = np.array([dr*self.width + dc for dr, dc in moves], dtype=np.intp)
+        self.choices = tuple(tuple(move for j, move in enumerate(moves) if bits >> j & 1) for bits in range(1 << len(moves)))
+        if inner is None:
+            inner = innerCells(padded)
+        self.inner = inner                                                      #flat index of every terrain (not border) cell - one array shared by the tables of a terrain
+        self.lookup = bytearray(padded.size)                                    #bits per flat cell - indexed directly for single cells
+        self.bits = np.frombuffer(self.lookup, dtype=np.uint8)                  #the same bytes as an array for whole-table updates
+        self.refresh(padded)
+
+    def refresh(self, padded):                                                  #rebuild the whole table
+        self.mask = self.passable(padded).ravel()
+        bits = np.zeros(len(self.inner), dtype=np.uint8)
+        for j, offset in enumerate(self.offsets):
+            bits |= self.mask[self.inner + offset].astype(np.uint8) << j
+        self.bits[self.inner] = bits
+
+    def refreshCells(self, flat, cells):                                        #only the changed cells (flat indices) and their neighbours
+        passable = self.passable(flat[cells])
+        self.mask[cells] = passable
+        for j, offset in enumerate(self.offsets):                               #the cell that reaches a changed cell with move j is cell - offset
+            reach = cells - offset
+            bit = np.uint8(1 << j)
+            self.bits[reach] = (self.bits[reach] & ~bit) | (passable.astype(np.uint8) << j)
+
+    def refreshCell(self, cell, old, new):                                      #one cell (flat index) changed from old to new terrain
+        passable = bool(self.passable(new))
+        if passable == bool(self.passable(old)):
+            return
+        self.mask[cell] = passable
+        lookup = self.lookup
+        for j, offset in enumerate(self.offsets.tolist()):
+            if passable:
+                lookup[cell - offset] |= 1 << j
+            else:
+                lookup[cell - offset] &= ~(1 << j) & 0xFF
+
+    def options(self, pos):                                                     #legal moves from pos (row, col)
+        return self.choices[self.lookup[(pos[0]+1)*self.width + pos[1] + 1]]
+
+
+def makeTables(padded):
+    inner = innerCells(padded)
+    return {species: MoveTable(padded, moves, passable, inner) for species, (moves, passable) in SPECIES_MOVES.items()}
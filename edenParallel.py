@@ -0,0 +1,301 @@
+# edenParallel.py
+# Multi-core spatial-domain decomposition for a single large Eden world
+
+"""
+This module runs one Eden world across several worker processes.
+
+The world is cut into strips (rows or columns). Each worker owns the Ants,
+Butterflies and Lizards whose position is inside its strip, and keeps its own
+copy of the terrain of its strip plus a halo of HALO cells on either side
+(its window), with a SENTINEL border round it like any padded terrain
+(edenMoves.py). Its fossils, move tables and distance fields only cover the
+window, so a worker's memory and work grow with its strip, not the world.
+
+An agent moves at most two cells in a timestep (ants in the rain), so one
+that starts inside the strip never leaves the window. The halo is wider than
+that so the distance fields (edenFields.py) still see food just over the edge
+of the strip; food further away in another strip is not seen.
+
+The coordinator (this process) keeps the whole terrain, in a multiprocessing
+shared memory block (edenShared.py) the workers copy their window from once,
+and the phases that act on the whole world at once: the Caterpillar, the
+Worm, Fossils and Rain/flooding. Each timestep the workers send back the
+cells they changed, and the coordinator passes every worker the changes
+inside its window that it did not make itself - the halo changes of its
+neighbours and the coordinator's own (worm tails, flooding).
+
+Agents that end a timestep outside their strip are handed back to the
+coordinator, which passes them to their new owner at the start of the next
+timestep. Worker positions are kept in window coordinates and turned back
+into world coordinates before they are sent.
+
+Ants are the only agents that write terrain while the workers run, and they
+only ever turn ground (0.2) or fossils (0.21) into tunnel (0.1), which no
+animal stepping in the same phase treats differently. So strips never need to
+lock each other, and the results match the single-process engine
+statistically (timestep-for-timestep populations differ only by random draws).
+
+runWorlds() runs many independent worlds (one seed each) over a process pool
+instead. The scenario is published once in shared memory; each world attaches
+to it by name and keeps a copy-on-write terrain, so only the cells a world
+changes are copied into that worker.
+
+Usage:
+    python edenParallel.py 1000 8            (1000 timesteps over 8 workers)
+    python edenParallel.py 1000 8 --strips rows --seed 3
+    python edenParallel.py 1000 8 --worlds 32          (32 worlds, 8 at a time)
+"""
+
+
+import argparse
+import multiprocessing as mp
+import numpy as np
+import os
+import random
+
+from edenEngine import Garden
+from edenMoves import padTerrain
+from edenShared import SharedScenario, attachArray, detach, openWorld, shareArray
+
+
+HALO = 8                                                                        #cells of the next strips a worker keeps on either side of its own (at least 2)
+
+
+def stripBounds(shape, workers, axis):                                          #edges of each strip along rows (axis 0) or columns (axis 1)
+    return [int(b) for b in np.linspace(0, shape[axis], workers+1)]
+
+def ownerOf(pos, bounds, axis):                                                 #which strip (worker) an agent position belongs to
+    owner = int(np.searchsorted(bounds, pos[axis], side="right")) - 1
+    return min(max(owner, 0), len(bounds)-2)
+
+def stripWindow(shape, bounds, rank, axis, halo=HALO):                          #(top, left, bottom, right) of the terrain a worker keeps: its strip and the halo
+    window = [0, 0, shape[0], shape[1]]
+    window[axis] = max(bounds[rank] - halo, 0)
+    window[axis+2] = min(bounds[rank+1] + halo, shape[axis])
+    return tuple(window)
+
+def inWindow(rows, cols, window):                                               #mask of the cells (arrays of rows and cols) inside a window
+    top, left, bottom, right = window
+    return (rows >= top) & (rows < bottom) & (cols >= left) & (cols < right)
+
+def moveBy(critters, drow, dcol):                                               #shift the positions of agents (window <-> world coordinates)
+    for critter in critters:
+        critter.pos = (critter.pos[0] + drow, critter.pos[1] + dcol)
+
+
+def stripWorker(rank, conn, terrainspec, window, bounds, axis, seed):
+    if seed is not None:
+        random.seed(seed*1000 + rank + 1)                                       #each strip gets its own random stream
+    top, left, bottom, right = window
+    handles, shared = attachArray(terrainspec, "r")
+    garden = Garden(shared[top+1:bottom+1, left+1:right+1])                     #a private copy of the window - no critters yet, they arrive from the coordinator
+    del shared
+    detach(handles)
+
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:                                                     #coordinator is finished
+                break
+            raindance, lizzys, (ants, bflys, lizards), (rows, cols, values) = msg
+            rows, cols = rows - top, cols - left
+            changed = garden.terrain[rows, cols] != values                      #terrain changed by the coordinator or the strips next door
+            if changed.any():
+                garden.terrain[rows[changed], cols[changed]] = values[changed]
+                garden.refreshCells(rows[changed], cols[changed])
+            garden.changed = []
+            for critters in (ants, bflys, lizards, lizzys):
+                moveBy(critters, -top, -left)
+            garden.ants.extend(ants)
+            garden.bflys.extend(bflys)
+            garden.lizzys.extend(lizards)
+            garden.raindance = raindance
+
+            garden.stepFood()                                                   #fossils as left by the coordinator last timestep
+            garden.stepAnts()
+            garden.stepButterflies(lizzys)                                      #butterflies can be eaten by a lizard of any strip in the window
+            bcount = len(garden.bflys)
+            garden.bflys = [bfly for bfly in garden.bflys if bfly.status == "alive"]
+            garden.stepLizards()
+
+            #hand agents that left the strip back to the coordinator
+            leaving = ([], [], [])
+            for k, critters in enumerate((garden.ants, garden.bflys, garden.lizzys)):
+                moveBy(critters, top, left)
+                staying = []
+                for critter in critters:
+                    if ownerOf(critter.getPos(), bounds, axis) == rank:
+                        staying.append(critter)
+                    else:
+                        leaving[k].append(critter)
+                critters[:] = staying
+
+            cells = np.array(sorted(set(garden.changed)), dtype=np.intp).reshape(-1, 2)
+            changed = (cells[:, 0] + top, cells[:, 1] + left, garden.terrain[cells[:, 0], cells[:, 1]])
+            conn.send((leaving, len(garden.ants), bcount, len(garden.bflys), garden.lizzys, changed))
+            for critters in (garden.ants, garden.bflys, garden.lizzys):
+                moveBy(critters, -top, -left)
+    finally:
+        conn.close()
+
+
+class ParallelGarden:
+
+    def __init__(self, backdrop, critters, workers=None, axis=1, seed=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if seed is not None:
+            random.seed(seed)
+
+        self.shm, terrainspec = shareArray(padTerrain(backdrop))                #padded, so the coordinator garden uses the block in place
+        self.handles, padded = attachArray(terrainspec, "w")
+
+        #the coordinator garden spawns everything, then keeps the worms and caterpillar for itself
+        self.garden = Garden(critters=critters, padded=padded)
+        self.terrain = self.garden.terrain
+        self.axis = axis
+        self.bounds = stripBounds(self.terrain.shape, workers, axis)
+        self.windows = [stripWindow(self.terrain.shape, self.bounds, rank, axis) for rank in range(workers)]
+        self.inbox = [([], [], []) for _ in range(workers)]
+        self.route((self.garden.ants, self.garden.bflys, self.garden.lizzys))
+        self.lizzys = list(self.garden.lizzys)
+        self.nants = len(self.garden.ants)
+        self.nbflys = len(self.garden.bflys)
+        self.garden.ants, self.garden.bflys, self.garden.lizzys = [], [], []
+        self.changed = []                                                       #(rank or None for the coordinator, rows, cols, values) changed last timestep
+
+        self.conns = []
+        self.procs = []
+        for rank in range(workers):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=stripWorker, args=(rank, child, terrainspec, self.windows[rank], self.bounds, axis, seed), daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def route(self, critters):                                                  #(ants, bflys, lizzys) -> next timestep inbox of their owners
+        for k, group in enumerate(critters):
+            for critter in group:
+                self.inbox[ownerOf(critter.getPos(), self.bounds, self.axis)][k].append(critter)
+
+    def changesFor(self, rank):                                                 #(rows, cols, values) changed last timestep inside a worker's window, but not by it
+        chunks = [(rows, cols, values) for source, rows, cols, values in self.changed if source != rank]
+        if not chunks:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+        rows, cols, values = (np.concatenate(parts) for parts in zip(*chunks))
+        inside = inWindow(rows, cols, self.windows[rank])
+        rows, cols, values = rows[inside], cols[inside], values[inside]
+        cells = rows*self.terrain.shape[1] + cols                               #a cell dug by a strip and then flooded by the rain comes twice -
+        cells, last = np.unique(cells[::-1], return_index=True)                 #only its last value counts
+        last = len(rows) - 1 - last
+        return rows[last], cols[last], values[last]
+
+    def lizardsFor(self, rank):                                                 #lizards inside a worker's window (the only ones its butterflies can meet)
+        window = self.windows[rank]
+        return [lizzy for lizzy in self.lizzys if inWindow(lizzy.pos[0], lizzy.pos[1], window)]
+
+    def step(self):
+        garden = self.garden
+        for rank, conn in enumerate(self.conns):
+            conn.send((garden.raindance, self.lizardsFor(rank), self.inbox[rank], self.changesFor(rank)))
+        self.inbox = [([], [], []) for _ in self.conns]
+        self.changed = []
+
+        self.lizzys = []
+        self.nants = 0
+        bcount = 0
+        self.nbflys = 0
+        for rank, conn in enumerate(self.conns):
+            leaving, nants, nbefore, nafter, lizzys, (rows, cols, values) = conn.recv()
+            if len(rows):
+                self.terrain[rows, cols] = values
+                garden.refreshCells(rows, cols)
+                self.changed.append((rank, rows, cols, values))
+            self.route(leaving)
+            self.nants = self.nants + nants + len(leaving[0])
+            bcount = bcount + nbefore
+            self.nbflys = self.nbflys + nafter + len(leaving[1])
+            self.lizzys.extend(lizzys)
+            self.lizzys.extend(leaving[2])
+
+        garden.changed = []                                                     #the coordinator's own changes from here on
+        garden.stepCaterpillar(bcount)                                          #new butterflies join the strip they are born in
+        self.route(([], garden.bflys, []))
+        self.nbflys = self.nbflys + len(garden.bflys)
+        garden.bflys = []
+
+        garden.stepWorms()
+        garden.stepFood()
+        garden.stepRain()
+        garden.t = garden.t + 1
+        if garden.changed:
+            cells = np.array(sorted(set(garden.changed)), dtype=np.intp).reshape(-1, 2)
+            self.changed.append((None, cells[:, 0], cells[:, 1], self.terrain[cells[:, 0], cells[:, 1]]))
+        garden.changed = None
+
+    def counts(self):
+        counts = self.garden.counts()
+        counts.update(ants=self.nants, butterflies=self.nbflys, lizards=len(self.lizzys))
+        return counts
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(None)
+        for proc in self.procs:
+            proc.join()
+        for conn in self.conns:
+            conn.close()
+        self.terrain = None                                                     #release the views before the block goes
+        self.garden = None
+        detach(self.handles)
+        self.shm.close()
+        self.shm.unlink()
+
+
+def worldWorker(spec, seed, timesteps):
+    random.seed(seed)
+    garden, handles = openWorld(spec)                                           #no csv parsing - attach to the shared scenario
+    for t in range(timesteps):
+        garden.step()
+    counts = garden.counts()
+    del garden
+    detach(handles)
+    return seed, counts
+
+def runWorlds(backdrop, critters, worlds, timesteps, workers=None, seed=0):
+    with SharedScenario(backdrop, critters) as scenario:
+        with mp.Pool(workers) as pool:
+            return pool.starmap(worldWorker, [(scenario.spec, seed+k, timesteps) for k in range(worlds)])
+
+
+def main():
+    from playEden import load_scenario
+
+    parser = argparse.ArgumentParser(description="Run one Eden world split into strips across worker processes")
+    parser.add_argument("timesteps", type=int)
+    parser.add_argument("workers", type=int, nargs="?", default=os.cpu_count())
+    parser.add_argument("--strips", choices=("rows", "cols"), default="cols", help="cut the world into horizontal (rows) or vertical (cols) strips")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--world", default=None, help="worldscene csv to play (default data/worldscene.csv)")
+    parser.add_argument("--alive", default=None, help="alive csv or .npy population file (default data/alive.csv)")
+    parser.add_argument("--worlds", type=int, default=None, help="run this many independent worlds over the workers instead of splitting one")
+    args = parser.parse_args()
+    backdrop, critters = load_scenario(args.world, args.alive)
+
+    if args.worlds is not None:
+        for seed, counts in runWorlds(backdrop, critters, args.worlds, args.timesteps, args.workers, args.seed or 0):
+            print("Survived (seed", str(seed)+"): ", counts)
+        return
+
+    eden = ParallelGarden(backdrop, critters, args.workers, 0 if args.strips == "rows" else 1, args.seed)
+    try:
+        print("Started:  ", eden.counts())
+        for t in range(args.timesteps):
+            eden.step()
+        print("Survived: ", eden.counts())
+    finally:
+        eden.close()
+
+if __name__ == "__main__":
+    main()
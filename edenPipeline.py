@@ -0,0 +1,124 @@
+# edenPipeline.py
+# Simulate the next timesteps while the current one is being drawn
+
+"""
+In the plain live view (playEden.py) the garden is stepped and then drawn, one
+after the other. A Pipeline runs the garden in an engine process (or thread)
+instead: after every timestep to draw it puts a snapshot (edenRecord.Frame -
+a copy of the terrain and the animals) into a small bounded queue, and the
+window takes the snapshots out and draws them. So the next timestep is
+simulated while this one is drawn.
+
+The queue holds at most `depth` snapshots (default 2 - one being drawn, one
+ready). When drawing is slower than simulating the engine waits for room in
+the queue (backpressure), so it never runs far ahead or fills memory. When the
+engine raises, the error comes through the queue in place of the end marker
+and iterating the Pipeline raises it.
+
+    python playEden.py 1000 D --pipeline
+
+matplotlib has to stay in the main thread, so the engine is the side that
+moves. An engine process runs in parallel with drawing; an engine thread
+(process=False) shares the interpreter with the window and only overlaps with
+it while either side is waiting.
+"""
+
+
+import contextlib
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import traceback
+
+import numpy as np
+
+
+DONE = "done"                                                                   #put after the last snapshot
+
+
+class Failed:                                                                   #put instead of DONE when the engine raised - Pipeline raises it again
+
+    def __init__(self, error):
+        self.error = error
+        self.trace = "".join(traceback.format_exception(error))                 #a traceback does not travel to another process - its text does
+
+
+def send(frames, stop, item):                                                   #wait for room in the queue (backpressure) - False if stopped first
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def engineWorker(frames, stop, state, backdrop, critters, timestep, render_every, quiet=False, sync=False, behaviour=None):
+    from edenEngine import Garden
+    from edenRecord import snapshot
+    from playEden import playFrames
+
+    random.setstate(state)                                                      #carry on the caller's random stream (a new process is reseeded)
+    try:
+        with contextlib.ExitStack() as stack:
+            if quiet:                                                           #no garden log (the window is drawing in the terminal)
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            options = {}
+            if behaviour is not None:                                           #hunger, rain window and worm life of the run
+                from edenConfig import applyBehaviour
+                options = applyBehaviour(behaviour)
+            garden = Garden(np.array(backdrop), critters, sync=sync, **options)
+            for frame in playFrames(garden, timestep, render_every):
+                if not send(frames, stop, snapshot(frame)):
+                    return
+        send(frames, stop, DONE)
+    except Exception as e:
+        send(frames, stop, Failed(e))
+
+
+class Pipeline:
+
+    def __init__(self, backdrop, critters, timestep, render_every=1, depth=2, process=True, quiet=False, sync=False, behaviour=None):
+        #quiet only silences an engine process - an engine thread shares sys.stdout with the caller, which keeps it quiet itself
+        args = (random.getstate(), backdrop, critters, timestep, render_every, quiet and process, sync, behaviour)
+        if process:
+            self.frames = mp.Queue(depth)
+            self.stop = mp.Event()
+            self.engine = mp.Process(target=engineWorker, args=(self.frames, self.stop) + args, daemon=True)
+        else:
+            self.frames = queue.Queue(depth)
+            self.stop = threading.Event()
+            self.engine = threading.Thread(target=engineWorker, args=(self.frames, self.stop) + args, daemon=True)
+        self.engine.start()
+
+    def __iter__(self):                                                         #snapshots in timestep order until the engine is done (or its error)
+        while True:
+            try:
+                frame = self.frames.get(timeout=1)
+            except queue.Empty:
+                if not self.engine.is_alive():                                  #engine stopped without finishing
+                    raise RuntimeError("Eden engine stopped before the last timestep")
+                continue
+            if isinstance(frame, str) and frame == DONE:
+                return
+            if isinstance(frame, Failed):
+                if frame.error.__traceback__ is None:                           #from an engine process - show where it failed there
+                    raise frame.error from RuntimeError("in the Eden engine:\n" + frame.trace)
+                raise frame.error
+            yield frame
+
+    def close(self):                                                            #stop the engine (if it is still running) and wait for it
+        self.stop.set()
+        try:
+            while True:                                                         #make room so a waiting engine sees the stop
+                self.frames.get_nowait()
+        except queue.Empty:
+            pass
+        self.engine.join(timeout=5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,116 @@
+# edenPopulation.py
+# Typed loader for the animals of an Eden scenario
+
+"""
+This module reads the animals of a scenario into one typed numpy array
+(CRITTER_DTYPE, one row per animal) instead of lists of strings.
+
+alive.csv has one animal per line, ':' separated, and the columns depend on the
+species (SCHEMA). Every line is checked against the schema as it is read, so a
+bad row or column stops the load with its line number instead of turning into
+a string such as "False" that is always truthy.
+
+The same array can be saved as a compact binary population file (.npy), which
+loads without any parsing - use it for large populations:
+    python edenPopulation.py data/alive.csv data/alive.npy
+"""
+
+
+import numpy as np
+import sys
+
+
+SPECIES = ("Ant", "Butterfly", "Lizard", "Worm")                               #species codes are the index in this tuple
+
+#columns after the species name in alive.csv (the food column names the food list the animal eats from)
+SCHEMA = {
+    "Ant":       ("name", "row", "col", "status", "hungry", "fossilpos"),
+    "Butterfly": ("name", "row", "col", "colour", "status", "hungry", "flowerpos"),
+    "Lizard":    ("name", "row", "col", "status", "hungry"),
+    "Worm":      ("name", "row", "col", "status", "hungry"),
+}
+
+CRITTER_DTYPE = np.dtype([("species", "u1"), ("name", "S16"), ("row", "i4"), ("col", "i4"),
+                          ("colour", "S16"), ("alive", "?"), ("hungry", "?")])
+TEXT_BYTES = CRITTER_DTYPE["name"].itemsize                                     #longest name or colour a critter array holds (numpy would cut it short)
+
+STATUS = {"alive": True, "dead": False}
+TRUTH = {"True": True, "False": False}
+
+
+def checkText(column, value, where):                                            #name or colour that fits a critter array, or ValueError
+    try:
+        size = len(value.encode("ascii"))
+    except UnicodeEncodeError:
+        raise ValueError(where + ": " + column + " must be plain ASCII, not " + repr(value)) from None
+    if size > TEXT_BYTES:
+        raise ValueError(where + ": " + column + " " + repr(value) + " is longer than " + str(TEXT_BYTES) + " characters")
+    return value
+
+def parseCritter(fields, where="alive.csv"):                                   #one alive.csv line (already split on ':') -> one typed record
+    species = fields[0]
+    if species not in SCHEMA:
+        raise ValueError(where + ": unknown species " + repr(species))
+    columns = SCHEMA[species]
+    if len(fields) != len(columns) + 1:
+        raise ValueError(where + ": " + species + " needs " + str(len(columns)) + " columns after the species (" + ":".join(columns) + ")")
+
+    record = {"colour": ""}
+    for column, value in zip(columns, fields[1:]):
+        value = value.strip()
+        if column in ("row", "col"):
+            try:
+                record[column] = int(value)
+            except ValueError:
+                raise ValueError(where + ": " + column + " must be a whole number, not " + repr(value)) from None
+        elif column == "status":
+            if value not in STATUS:
+                raise ValueError(where + ": status must be 'alive' or 'dead', not " + repr(value))
+            record["alive"] = STATUS[value]
+        elif column == "hungry":
+            if value not in TRUTH:
+                raise ValueError(where + ": hungry must be 'True' or 'False', not " + repr(value))
+            record["hungry"] = TRUTH[value]
+        elif column in ("fossilpos", "flowerpos"):
+            if value != column:
+                raise ValueError(where + ": last column must be " + repr(column) + ", not " + repr(value))
+        else:
+            record[column] = checkText(column, value, where)
+    return (SPECIES.index(species), record["name"], record["row"], record["col"], record["colour"], record["alive"], record["hungry"])
+
+
+def readAlive(path):                                                            #alive.csv -> critter array in one pass
+    records = []
+    with open(path, "r") as alive:
+        for number, line in enumerate(alive, 1):
+            if line.strip():
+                records.append(parseCritter(line.rstrip("\n").split(":"), path + " line " + str(number)))
+    return np.array(records, dtype=CRITTER_DTYPE)
+
+
+def loadPopulation(path):                                                       #.npy population file or alive.csv
+    if path.endswith(".npy"):
+        critters = np.load(path, allow_pickle=False)
+        if critters.dtype != CRITTER_DTYPE:
+            raise ValueError(path + ": not an Eden population file")
+        return critters
+    return readAlive(path)
+
+def savePopulation(path, critters):                                             #critter array, or records (species, name, row, col, colour, alive, hungry)
+    if not (isinstance(critters, np.ndarray) and critters.dtype == CRITTER_DTYPE):
+        for record in critters:                                                 #check before numpy cuts a long name short
+            checkText("name", record[1], path)
+            checkText("colour", record[4], path)
+    np.save(path, np.asarray(critters, dtype=CRITTER_DTYPE), allow_pickle=False)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python edenPopulation.py alive.csv population.npy")
+        sys.exit(1)
+    critters = loadPopulation(sys.argv[1])
+    savePopulation(sys.argv[2], critters)
+    print("Saved", len(critters), "animals to", sys.argv[2])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# edenRecord.py
+# Compact recordings of Eden runs, played back without re-simulating
+
+"""
+A Recorder writes what a Garden looks like after every timestep to a
+recording file, and a Recording reads any timestep back as a Frame - the
+attributes playEden.drawGarden() needs, with nothing to simulate. So a run
+is simulated once and can then be watched (replayEden.py) as often as wanted.
+
+    python edenRecord.py 1000 runs/eden.rec --seed 3      (record 1000 headless timesteps)
+
+Recording file:
+- the file starts with MAGIC, then the timesteps in chunks of --every
+  timesteps, each chunk a compressed npz:
+  - a keyframe: the whole terrain and the flooded cells at the first timestep
+  - per timestep: the terrain cells that changed (flat index and new value),
+    newly flooded cells, the rain and caterpillar count
+  - per timestep and animal: its roster id, position, caterpillar stage and
+    worm tail
+- then a trailer npz: where every chunk starts, the base terrain, the rain
+  positions and the roster - one entry per animal ever seen, with its kind,
+  name, colour and the timesteps it was born and died (or -1)
+- and the trailer position and MAGIC again at the very end.
+
+To show timestep f only chunk f // every is read, and at most every-1
+timesteps of changed cells are applied to its keyframe. The flowers and
+fossils are the terrain cells with their value (0.745 and 0.21), as in the
+engine.
+"""
+
+
+import argparse
+import contextlib
+import functools
+import io
+import numpy as np
+import os
+import random
+import struct
+
+from Eden import *
+
+
+MAGIC = b"EDENREC1"
+KINDS = ("ants", "bflys", "catp", "lizzys", "worms")                          #animal lists of a Garden - roster kind is the index in this tuple
+STAGES = (None, "caterpillar", "cocoon")                                        #Caterpillar.stage codes (None for the other animals)
+
+
+class Frame:
+    #one timestep of a garden for drawing - the same attributes playEden.drawGarden() reads from a Garden
+
+    def __init__(self, t, terrain, LIMITS, animals, finalcatp, rain, raindance, allflooded):
+        self.t = t
+        self.terrain = terrain
+        self.LIMITS = LIMITS
+        self.ants, self.bflys, self.catp, self.lizzys, self.worms = animals
+        self.finalcatp = finalcatp
+        self.raindance = raindance
+        self.allflooded = allflooded
+
+        flower_rows, flower_cols = np.where(terrain == 0.745)
+        self.flowerpos = [Flower("F"+str(i), pos) for i, pos in enumerate(zip(flower_rows.tolist(), flower_cols.tolist()))]
+        fossil_rows, fossil_cols = np.where(terrain == 0.21)
+        self.fossilpos = [Fossil("FF"+str(i), pos) for i, pos in enumerate(zip(fossil_rows.tolist(), fossil_cols.tolist()))]
+
+        self.rain_r, self.rain_c, self.rain_r2, self.rain_c2 = [], [], [], []
+        if raindance:                                                           #same plot lists as Garden.stepRain
+            self.rain_r = [pos[1] for pos in rain[::2]]
+            self.rain_c = [pos[0] for pos in rain[::2]]
+            self.rain_r2 = [pos[1] for pos in rain[1::2]]
+            self.rain_c2 = [pos[0] for pos in rain[1::2]]
+
+
+def snapshot(garden):                                                          #Frame copied from a live garden - later steps do not change it
+    animals = tuple([makeAnimal(kind, critter.name, getattr(critter, "colour", ""), critter.pos, list(getattr(critter, "oldtail", ())),
+                                getattr(critter, "stage", None)) for critter in getattr(garden, name)] for kind, name in enumerate(KINDS))
+    rain = [drop.getPos() for drop in garden.rain] if garden.raindance else []
+    return Frame(garden.t, np.array(garden.terrain), garden.LIMITS, animals, garden.finalcatp,
+                 rain, garden.raindance, list(garden.allflooded))
+
+
+def makeAnimal(kind, name, colour, pos, tail, stage=None):                     #a stand-in animal for drawing only
+    row, col = pos
+    if kind == 0:
+        return Ant(name, row, col, "alive", False, [])
+    if kind == 1:
+        return Butterfly(name, row, col, colour, "alive", False, [])
+    if kind == 2:
+        return Caterpillar(name, row, col, "alive", stage)
+    if kind == 3:
+        return Lizard(name, row, col, "alive", False)
+    worm = Worm(name, row, col, "alive", False)
+    worm.oldtail = tail
+    return worm
+
+
+class Recorder:
+
+    def __init__(self, path, garden, every=50):
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.garden = garden
+        self.every = every                                                      #timesteps per chunk (one keyframe each)
+        self.offsets = []
+        self.frames = 0
+        self.LIMITS = np.array(garden.LIMITS)
+        self.rain = np.array([drop.getPos() for drop in garden.rain], dtype=np.int32).reshape(-1, 2)
+        self.ids = {}                                                           #live animal -> roster id
+        self.roster = []                                                        #[kind, name, colour, born, died] per animal ever seen
+        self.flooded = len(garden.allflooded)
+        self.chunk = None
+        garden.changed = []                                                     #the garden collects the cells it changes from now on
+
+    def capture(self):                                                          #call after every Garden.step()
+        garden = self.garden
+        if self.frames % self.every == 0:
+            self.flush()
+            self.chunk = {"terrain": np.array(garden.terrain), "flooded": np.array(garden.allflooded, dtype=np.int32).reshape(-1, 2),
+                          "t": [], "raindance": [], "finalcatp": [],
+                          "cells": [], "values": [], "cellcount": [], "newflood": [], "floodcount": [],
+                          "ids": [], "rows": [], "cols": [], "stages": [], "taillen": [], "tails": [], "agentcount": []}
+            cells = []
+            newflood = []
+        else:
+            rows, cols = zip(*garden.changed) if garden.changed else ((), ())
+            cells = np.unique(np.ravel_multi_index((np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), garden.terrain.shape)).tolist()
+            newflood = garden.allflooded[self.flooded:]
+        garden.changed = []
+        self.flooded = len(garden.allflooded)
+
+        chunk = self.chunk
+        chunk["t"].append(garden.t)
+        chunk["raindance"].append(garden.raindance)
+        chunk["finalcatp"].append(garden.finalcatp)
+        chunk["cells"].extend(cells)
+        chunk["values"].extend(garden.terrain.flat[cells].tolist())
+        chunk["cellcount"].append(len(cells))
+        chunk["newflood"].extend(newflood)
+        chunk["floodcount"].append(len(newflood))
+
+        seen = {}
+        before = len(chunk["ids"])
+        for kind, name in enumerate(KINDS):
+            for critter in getattr(garden, name):
+                rid = self.ids.get(critter)
+                if rid is None:                                                 #birth
+                    rid = len(self.roster)
+                    self.roster.append([kind, critter.name, getattr(critter, "colour", ""), self.frames, -1])
+                seen[critter] = rid
+                chunk["ids"].append(rid)
+                chunk["rows"].append(critter.pos[0])
+                chunk["cols"].append(critter.pos[1])
+                chunk["stages"].append(STAGES.index(critter.stage) if kind == 2 else 0)
+                tail = critter.oldtail if kind == 4 else ()
+                chunk["taillen"].append(len(tail))
+                chunk["tails"].extend(tail)
+        chunk["agentcount"].append(len(chunk["ids"]) - before)
+        for critter, rid in self.ids.items():
+            if critter not in seen:                                             #death
+                self.roster[rid][4] = self.frames
+        self.ids = seen
+        self.frames = self.frames + 1
+
+    def flush(self):                                                            #write the chunk being filled
+        chunk = self.chunk
+        if chunk is None:
+            return
+        arrays = {"terrain": chunk["terrain"], "flooded": chunk["flooded"],
+                  "t": np.array(chunk["t"], dtype=np.int32), "raindance": np.array(chunk["raindance"], dtype=bool),
+                  "finalcatp": np.array(chunk["finalcatp"], dtype=np.int32),
+                  "cells": np.array(chunk["cells"], dtype=np.int32), "values": np.array(chunk["values"], dtype=float),
+                  "newflood": np.array(chunk["newflood"], dtype=np.int32).reshape(-1, 2),
+                  "rows": np.array(chunk["rows"], dtype=np.int32), "cols": np.array(chunk["cols"], dtype=np.int32),
+                  "stages": np.array(chunk["stages"], dtype=np.int8),
+                  "tails": np.array(chunk["tails"], dtype=np.int32).reshape(-1, 2)}
+        for name in ("cellcount", "floodcount", "ids", "taillen", "agentcount"):
+            arrays[name] = np.array(chunk[name], dtype=np.int32)
+        self.offsets.append(self.file.tell())
+        np.savez_compressed(self.file, **arrays)
+        self.chunk = None
+
+    def close(self):
+        self.flush()
+        trailer = self.file.tell()
+        self.offsets.append(trailer)
+        columns = list(zip(*self.roster)) or [()]*5
+        np.savez(self.file, offsets=np.array(self.offsets, dtype=np.int64), frames=np.int64(self.frames), every=np.int64(self.every),
+                 LIMITS=self.LIMITS, rain=self.rain, kind=np.array(columns[0], dtype=np.uint8), name=np.array(columns[1], dtype="U16"),
+                 colour=np.array(columns[2], dtype="U16"), born=np.array(columns[3], dtype=np.int32), died=np.array(columns[4], dtype=np.int32))
+        self.file.write(struct.pack("<q", trailer) + MAGIC)
+        self.file.close()
+        self.garden.changed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Recording:
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError(path + ": not an Eden recording")
+        self.file.seek(-8 - len(MAGIC), os.SEEK_END)
+        end = self.file.read()
+        if end[8:] != MAGIC:
+            self.file.close()
+            raise ValueError(path + ": Eden recording was not finished (no trailer)")
+        trailer = struct.unpack("<q", end[:8])[0]
+        self.file.seek(trailer)
+        with np.load(io.BytesIO(self.file.read()), allow_pickle=False) as data:
+            self.trailer = {name: data[name] for name in data.files}
+        self.offsets = self.trailer["offsets"].tolist()
+        self.frames = int(self.trailer["frames"])
+        self.every = int(self.trailer["every"])
+        self.LIMITS = self.trailer["LIMITS"]
+        self.rain = [tuple(pos) for pos in self.trailer["rain"].tolist()]
+        self.chunk = functools.lru_cache(maxsize=4)(self.readChunk)
+
+    def __len__(self):
+        return self.frames
+
+    def readChunk(self, k):
+        self.file.seek(self.offsets[k])
+        blob = self.file.read(self.offsets[k+1] - self.offsets[k])
+        with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+            chunk = {name: data[name] for name in data.files}
+        for name in ("cellcount", "floodcount", "agentcount", "taillen"):          #where each timestep (or tail) starts
+            chunk[name + "start"] = np.concatenate(([0], np.cumsum(chunk[name])))
+        return chunk
+
+    def frame(self, f):                                                         #timestep f (0 is the state after the first Garden.step())
+        if not 0 <= f < self.frames:
+            raise IndexError("recording has " + str(self.frames) + " timesteps, not " + str(f+1))
+        k, j = divmod(f, self.every)
+        chunk = self.chunk(k)
+
+        terrain = np.array(chunk["terrain"])
+        cellstart = chunk["cellcountstart"]
+        for i in range(1, j+1):                                                 #changed cells since the keyframe, in order
+            changed = slice(cellstart[i], cellstart[i+1])
+            terrain.flat[chunk["cells"][changed]] = chunk["values"][changed]
+        flooded = chunk["flooded"].tolist() + chunk["newflood"][chunk["floodcountstart"][1]:chunk["floodcountstart"][j+1]].tolist()
+
+        animals = ([], [], [], [], [])
+        roster = self.trailer
+        tailstart = chunk["taillenstart"]
+        first, last = chunk["agentcountstart"][j], chunk["agentcountstart"][j+1]
+        stages = [STAGES[code] for code in chunk["stages"][first:last].tolist()]
+        for n, rid in enumerate(chunk["ids"][first:last].tolist(), first):
+            kind = int(roster["kind"][rid])
+            tail = [tuple(pos) for pos in chunk["tails"][tailstart[n]:tailstart[n+1]].tolist()]
+            pos = (int(chunk["rows"][n]), int(chunk["cols"][n]))
+            animals[kind].append(makeAnimal(kind, str(roster["name"][rid]), str(roster["colour"][rid]), pos, tail, stages[n-first]))
+
+        return Frame(int(chunk["t"][j]), terrain, self.LIMITS, animals, int(chunk["finalcatp"][j]),
+                     self.rain, bool(chunk["raindance"][j]), [tuple(cell) for cell in flooded])
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    from edenEngine import Garden
+    from playEden import load_scenario
+
+    parser = argparse.ArgumentParser(description="Record a headless Eden run for replayEden.py")
+    parser.add_argument("timesteps", type=int)
+    parser.add_argument("path", help="recording file to write")
+    parser.add_argument("--every", type=int, default=50, help="timesteps per keyframe")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--world", default=None, help="worldscene csv (default data/worldscene.csv)")
+    parser.add_argument("--alive", default=None, help="alive csv or .npy population file (default data/alive.csv)")
+    parser.add_argument("--sync", action="store_true", help="synchronous ants and worms (see edenEngine.py)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    scenario = load_scenario(args.world, args.alive)
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        garden = Garden(np.array(scenario.backdrop), scenario.critters, sync=args.sync)
+        with Recorder(args.path, garden, args.every) as recorder:
+            for t in range(args.timesteps):
+                garden.step()
+                recorder.capture()
+    print("Recorded", args.timesteps, "timesteps to", args.path, "(" + str(round(os.path.getsize(args.path)/1024, 1)), "KB)")
+
+if __name__ == "__main__":
+    main()
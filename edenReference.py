@@ -0,0 +1,257 @@
+# edenReference.py
+# The reference engine: the Eden.py stepChange logic one animal after another, written the plain way
+
+"""
+A slow and plain engine with the rules of Garden (edenEngine.py), kept as the
+reference that edenCheck.py checks the faster engines against. It is written
+the way the simulation was before it was optimised, so it shares none of the
+machinery it checks:
+- the legal moves of an animal come from the 3x3 subgrid round it
+  (getSubgrid), tested cell by cell against its species' terrain - not from
+  the move tables of edenMoves.py
+- hungry ants and butterflies follow a distance field that is searched again
+  from scratch (breadth-first, from every food cell) whenever a cell changes
+  in a way that matters to it - not the repaired fields of edenFields.py
+- every caterpillar keeps its own stage and timer and they are advanced one
+  after another - not the arrays of edenLifecycle.py
+
+What it does share are the rules: the animals themselves (Eden.py stepChange),
+the moves of each species and the terrain it may enter (edenMoves.SPECIES_MOVES),
+the lifecycle table (edenLifecycle.LIFECYCLE) and where caterpillars hatch.
+It makes the same random draws in the same order as Garden, so the two must
+match exactly:
+
+    python edenCheck.py 300 serial
+"""
+
+
+import numpy as np
+import random
+from collections import deque
+
+from Eden import Ant, Butterfly, Caterpillar, Flower, Fossil, Lizard, Worm
+from edenEngine import HUNGER, RAIN, WORMLIFE
+from edenFields import isFlower, isFossil
+from edenLifecycle import LIFECYCLE, spawnSite
+from edenMoves import SPECIES_MOVES
+from edenPopulation import SPECIES
+
+
+STAGES = [stage for stage, steps, moves in LIFECYCLE] + ["butterfly"]
+
+
+def getSubgrid(terrain, pos):                                                   #3x3 terrain round pos (NaN off the edge of the map - nobody may go there)
+    sub = np.full((3, 3), np.nan)
+    rows, cols = terrain.shape
+    for r in range(3):
+        for c in range(3):
+            row, col = pos[0] + r - 1, pos[1] + c - 1
+            if 0 <= row < rows and 0 <= col < cols:
+                sub[r, c] = terrain[row, col]
+    return sub
+
+def legalMoves(species, subgrid):                                               #moves of the species into terrain it may enter
+    moves, passable = SPECIES_MOVES[species]
+    return tuple(move for move in moves if passable(subgrid[move[0]+1, move[1]+1]))
+
+
+class SearchField:                                                              #how many moves to the nearest food, searched again when stale
+
+    def __init__(self, terrain, species, isfood):
+        self.terrain = terrain
+        self.moves, self.passable = SPECIES_MOVES[species]
+        self.isfood = isfood
+        self.dist = {}                                                          #(row, col) -> moves to food (cells that can not reach food are left out)
+        self.stale = True
+
+    def changed(self, old, new):                                                #a cell changed from old to new terrain
+        if self.isfood(old) != self.isfood(new) or bool(self.passable(old)) != bool(self.passable(new)):
+            self.stale = True
+
+    def search(self):
+        terrain = self.terrain.tolist()
+        rows, cols = len(terrain), len(terrain[0])
+        self.dist = {}
+        queue = deque()
+        for row in range(rows):
+            for col in range(cols):
+                if self.passable(terrain[row][col]) and self.isfood(terrain[row][col]):
+                    self.dist[(row, col)] = 0
+                    queue.append((row, col))
+        while queue:
+            row, col = queue.popleft()
+            for dr, dc in self.moves:
+                r, c = row - dr, col - dc                                       #the cell that gets here with this move
+                if (r, c) not in self.dist and 0 <= r < rows and 0 <= c < cols and self.passable(terrain[r][c]):
+                    self.dist[(r, c)] = self.dist[(row, col)] + 1
+                    queue.append((r, c))
+        self.stale = False
+
+    def at(self, pos):                                                          #None if no food can be reached from pos
+        if self.stale:
+            self.search()
+        return self.dist.get(pos)
+
+    def downhill(self, pos, moves):                                             #first legal move one step closer to food (None if there is none)
+        d = self.at(pos)
+        if d is None or d == 0:
+            return None
+        for move in moves:
+            if self.dist.get((pos[0] + move[0], pos[1] + move[1])) == d - 1:
+                return move
+        return None
+
+
+class ReferenceGarden:
+
+    def __init__(self, terrain, critters=(), hunger=HUNGER, rain=RAIN, wormlife=WORMLIFE):
+        self.terrain = np.array(terrain, dtype=float)
+        self.fields = {"ant": SearchField(self.terrain, "ant", isFossil), "butterfly": SearchField(self.terrain, "butterfly", isFlower)}
+
+        self.ants = []
+        self.bflys = []
+        self.lizzys = []
+        self.worms = []
+        self.catp = []                                                          #caterpillars and cocoons
+        self.timer = {}                                                         #caterpillar -> timesteps spent in its stage
+        self.hatched = 0
+        self.spawn = spawnSite(self.terrain)
+        self.lifeevents = []
+        self.anthunger, self.bflyhunger = hunger
+
+        flower_rows, flower_cols = np.where(self.terrain == 0.745)
+        self.flowerpos = [Flower("F"+str(i), (row, col)) for i, (row, col) in enumerate(zip(flower_rows.tolist(), flower_cols.tolist()))]
+        self.fossilpos = []
+
+        self.wormlife = wormlife
+        rows, cols = self.terrain.shape
+        self.wormbirth = (35*rows//59, 15*rows//59, 10*cols//112, 90*cols//112)
+        self.raindance = False
+        self.rainwindow = rain
+        self.t = 0
+
+        for code, species in enumerate(SPECIES):
+            for critter in critters[critters["species"] == code] if len(critters) > 0 else ():
+                name, row, col = str(critter["name"]), int(critter["row"]), int(critter["col"])
+                status, hungry = "alive" if critter["alive"] else "dead", bool(critter["hungry"])
+                if species == "Ant":
+                    self.ants.append(Ant(name, row, col, status, hungry, self.fossilpos, self.anthunger))
+                elif species == "Butterfly":
+                    self.bflys.append(Butterfly(name, row, col, str(critter["colour"]), status, hungry, self.flowerpos, self.bflyhunger))
+                elif species == "Lizard":
+                    self.lizzys.append(Lizard(name, row, col, status, hungry))
+                else:
+                    self.worms.append(Worm(name, row, col, status, hungry, random.randint(*wormlife)))
+        self.originalbflys = len(self.bflys)
+        self.wormcount = max(len(self.worms), 1)
+
+    def moves(self, species, pos):
+        return legalMoves(species, getSubgrid(self.terrain, pos))
+
+    def setCell(self, row, col, value):
+        old = self.terrain[row, col]
+        if old != value:
+            self.terrain[row, col] = value
+            for field in self.fields.values():
+                field.changed(old, value)
+
+    def step(self):
+        self.stepAnts()
+        self.stepButterflies()
+        self.stepCaterpillar()
+        self.stepLizards()
+        self.stepWorms()
+        self.stepFood()
+        self.stepRain()
+        self.t = self.t + 1
+
+    def counts(self):
+        return {"fossils": len(self.fossilpos), "butterflies": len(self.bflys), "caterpillars": len(self.catp),
+                "ants": len(self.ants), "lizards": len(self.lizzys), "worms": len(self.worms), "flowers": len(self.flowerpos)}
+
+    def stepAnts(self):
+        for ant in self.ants:
+            for move in range(2 if self.raindance else 1):                      #if raining, ants move twice as fast
+                ant.stepChange(self.moves("ant", ant.pos), self.fossilpos, self.fields["ant"])
+                self.setCell(ant.pos[0], ant.pos[1], 0.1)                       #tunnel dug (and a fossil there eaten)
+
+    def stepButterflies(self):
+        species = "butterflyrain" if self.raindance else "butterfly"
+        for bfly in self.bflys:
+            bfly.stepChange(self.moves(species, bfly.pos), self.flowerpos, self.raindance, self.fields["butterfly"])
+            for lizzy in self.lizzys:
+                if bfly.pos == lizzy.pos or bfly.pos == lizzy.inReach():
+                    bfly.butterdeath(lizzy.name)
+
+    def stepCaterpillar(self):
+        bcount = len(self.bflys)                                                #eaten ones too - they leave the list at the end of this phase
+        events = []
+        cocoons = []
+        for c in self.catp:
+            self.timer[c] = self.timer[c] + 1
+            stage = STAGES.index(c.stage)
+            if self.timer[c] >= LIFECYCLE[stage][1]:
+                c.stage = STAGES[stage + 1]
+                self.timer[c] = 0
+                events.append((c.name, c.stage))
+                if c.stage == "butterfly":
+                    cocoons.append(c)
+        for c in cocoons:
+            self.catp.remove(c)
+            del self.timer[c]
+        babybflys = [Butterfly(c.name, c.pos[0], c.pos[1], "black", "alive", True, self.flowerpos, self.bflyhunger) for c in cocoons]
+
+        missing = self.originalbflys - bcount - len(self.catp) - len(babybflys)
+        if self.spawn is not None:
+            row, first, last = self.spawn
+            for i in range(max(missing, 0)):
+                self.hatched = self.hatched + 1
+                c = Caterpillar("C"+str(self.hatched), row, random.randint(first, last), "alive", STAGES[0])
+                self.catp.append(c)
+                self.timer[c] = 0
+                events.append((c.name, c.stage))
+
+        for c in self.catp:
+            if LIFECYCLE[STAGES.index(c.stage)][2]:                             #caterpillars move in the tree, cocoons hang still
+                c.stepChange(self.moves("caterpillar", c.pos))
+        self.lifeevents = events
+        self.bflys = [bfly for bfly in self.bflys if bfly.status == "alive"] + babybflys
+
+    def stepLizards(self):
+        for lizzy in self.lizzys:
+            lizzy.stepChange(self.moves("lizard", lizzy.pos))
+
+    def stepWorms(self):
+        dead = []
+        for worm in self.worms:
+            worm.stepChange(self.moves("worm", worm.pos))
+            worm.storeoldtail()
+            self.setCell(worm.pos[0], worm.pos[1], 0.7)
+            if len(worm.oldtail) >= worm.lifespan:
+                dead.append(worm)
+        for worm in dead:                                                       #its tail becomes fossils
+            for row, col in sorted(set(worm.oldtail)):
+                if self.terrain[row, col] == 0.7:
+                    self.setCell(row, col, 0.21)
+            worm.wormdeath()
+            self.worms.remove(worm)
+
+        row, rows, col, cols = self.wormbirth
+        for n in range(self.wormcount - len(self.worms)):                       #one born for every worm that died
+            name = "W"+str(self.t)+"."+str(n+1)
+            self.worms.append(Worm(name, row+random.randint(0,rows), col+random.randint(0,cols), "alive", False, random.randint(*self.wormlife)))
+
+    def stepFood(self):
+        fossil_rows, fossil_cols = np.where(self.terrain == 0.21)
+        self.fossilpos = [Fossil("FF"+str(f), (row, col)) for f, (row, col) in enumerate(zip(fossil_rows.tolist(), fossil_cols.tolist()))]
+
+    def stepRain(self):
+        self.raindance = self.rainwindow[0] < self.t < self.rainwindow[1]
+        if self.raindance:                                                      #flood the top row of tunnels
+            terrain = self.terrain.tolist()
+            for row in range(len(terrain)):
+                if 0.1 in terrain[row]:
+                    for col in range(len(terrain[row])):
+                        if terrain[row][col] == 0.1:
+                            self.setCell(row, col, 0.2)
+                    break
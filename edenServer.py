@@ -0,0 +1,368 @@
+# edenServer.py
+# Live Eden runs streamed to web browsers (no matplotlib window needed)
+
+"""
+Runs a Garden on a headless machine and streams it over a local HTTP /
+WebSocket server built on asyncio (no packages beyond the Python standard
+library):
+
+- GET /         a small browser viewer that draws the stream on a canvas
+- GET /ws       WebSocket stream of the run (JSON text messages):
+                - "init": the whole terrain (flat, row by row) and its shape
+                - "step": one timestep - the terrain cells that changed
+                  ([flat index, value] pairs), the position of every animal
+                  ([row, col, row, col, ...] per animal list), the population
+                  counts and whether it is raining
+- GET /metrics  timesteps per second, ms per timestep spent in each phase,
+                timesteps played and the clients connected (JSON)
+
+    python edenServer.py                      (play forever on http://127.0.0.1:8765)
+    python edenServer.py 5000 --rate 50 --port 8000 --seed 3
+
+The simulation never waits for a client. Each client has one pending message:
+when a client has not taken the last timestep yet the next one is merged into
+it (changed cells added, positions and counts replaced), so a slow client
+skips frames but its terrain stays right.
+
+StreamClient and fetch() are a matching client, for scripts and tests on the
+same machine.
+"""
+
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from edenEngine import PHASES, Garden
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"                                #RFC 6455
+KINDS = ("ants", "bflys", "catp", "lizzys", "worms")
+
+
+#WEBSOCKET FRAMES (only what the server and StreamClient need - text, close, ping/pong)
+def encodeFrame(payload, opcode=0x1, mask=False):
+    head = bytes([0x80 | opcode])
+    length = len(payload)
+    maskbit = 0x80 if mask else 0
+    if length < 126:
+        head = head + bytes([maskbit | length])
+    elif length < 1 << 16:
+        head = head + bytes([maskbit | 126]) + struct.pack(">H", length)
+    else:
+        head = head + bytes([maskbit | 127]) + struct.pack(">Q", length)
+    if mask:                                                                    #clients must mask what they send
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        head = head + key
+    return head + payload
+
+async def readFrame(reader):                                                    #-> (opcode, payload)
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+def acceptKey(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+class Client:                                                                   #one connected viewer
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = None                                                     #next message to send (timesteps merged into it while it waits)
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0                                                        #timesteps merged into a later message instead of sent
+
+    def post(self, step):
+        if self.pending is None:
+            self.pending = {"type": "step", "t": step["t"], "cells": dict(step["cells"]), "agents": step["agents"],
+                            "counts": step["counts"], "raining": step["raining"]}
+        else:
+            self.pending["cells"].update(step["cells"])
+            self.pending.update(t=step["t"], agents=step["agents"], counts=step["counts"], raining=step["raining"])
+            self.dropped = self.dropped + 1
+        self.ready.set()
+
+
+class EdenServer:
+
+    def __init__(self, garden, timesteps=None, rate=None, log=False):
+        self.garden = garden
+        self.timesteps = timesteps                                              #None plays forever
+        self.rate = rate                                                        #timesteps per second (None = as fast as it goes)
+        self.log = log                                                          #keep the garden's terminal log
+        self.clients = set()
+        self.streams = set()                                                    #tasks serving the WebSocket clients
+        self.server = None
+        self.stepped = deque(maxlen=100)                                        #(clock, ms per phase) of the last timesteps
+        self.quiet = open(os.devnull, "w")
+        garden.changed = []
+
+    async def start(self, host="127.0.0.1", port=8765):                        #-> (host, port) listened on (port 0 picks a free one)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def run(self):                                                        #play the garden, posting every timestep to every client
+        garden = self.garden
+        start = time.perf_counter()
+        played = 0
+        while self.timesteps is None or played < self.timesteps:
+            spent = []
+            with contextlib.nullcontext() if self.log else contextlib.redirect_stdout(self.quiet):
+                for phase in PHASES:
+                    began = time.perf_counter()
+                    getattr(garden, phase)()
+                    spent.append((time.perf_counter() - began) * 1000)
+                garden.t = garden.t + 1
+            self.stepped.append((time.perf_counter(), spent))
+            played = played + 1
+
+            step = self.stepMessage()
+            for client in self.clients:
+                client.post(step)
+
+            if self.rate is None:
+                await asyncio.sleep(0)                                          #let the clients and requests run
+            else:
+                await asyncio.sleep(max(start + played/self.rate - time.perf_counter(), 0))
+
+    def stepMessage(self):
+        garden = self.garden
+        rows, cols = zip(*garden.changed) if garden.changed else ((), ())
+        garden.changed = []
+        cells = np.unique(np.ravel_multi_index((np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), garden.terrain.shape))
+        agents = {}
+        for name in KINDS:
+            agents[name] = [value for critter in getattr(garden, name) for value in critter.pos]
+        return {"t": garden.t, "cells": list(zip(cells.tolist(), garden.terrain.flat[cells].tolist())), "agents": agents,
+                "counts": garden.counts(), "raining": garden.raindance}
+
+    def metrics(self):
+        stepped = list(self.stepped)
+        rate = 0.0
+        if len(stepped) > 1:
+            rate = (len(stepped) - 1) / max(stepped[-1][0] - stepped[0][0], 1e-9)
+        phases = {phase: round(sum(spent[k] for clock, spent in stepped) / max(len(stepped), 1), 4) for k, phase in enumerate(PHASES)}
+        return {"t": self.garden.t, "timesteps_per_second": round(rate, 2), "phase_ms": phases,
+                "clients": [{"sent": client.sent, "dropped": client.dropped} for client in self.clients]}
+
+    async def handle(self, reader, writer):                                     #one HTTP request (or WebSocket)
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        method, path = (lines[0].split() + ["", ""])[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if method == "GET" and path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            await self.stream(reader, writer, headers.get("sec-websocket-key", ""))
+            return
+        if method == "GET" and path == "/":
+            await self.respond(writer, "200 OK", "text/html; charset=utf-8", VIEWER_HTML.encode())
+        elif method == "GET" and path == "/metrics":
+            await self.respond(writer, "200 OK", "application/json", json.dumps(self.metrics()).encode())
+        else:
+            await self.respond(writer, "404 Not Found", "text/plain", b"not found")
+
+    async def respond(self, writer, status, kind, body):
+        writer.write(("HTTP/1.1 " + status + "\r\nContent-Type: " + kind + "\r\nContent-Length: " + str(len(body)) +
+                      "\r\nConnection: close\r\n\r\n").encode() + body)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+        writer.close()
+
+    async def stream(self, reader, writer, key):
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      "Sec-WebSocket-Accept: " + acceptKey(key) + "\r\n\r\n").encode())
+        self.streams.add(asyncio.current_task())
+        garden = self.garden
+        init = {"type": "init", "t": garden.t, "shape": garden.terrain.shape, "terrain": garden.terrain.ravel().tolist()}
+        client = Client(writer)
+        self.clients.add(client)                                                #every timestep after the init is posted to it
+        listener = asyncio.ensure_future(self.listen(reader, writer))
+        try:
+            writer.write(encodeFrame(json.dumps(init).encode()))
+            await writer.drain()
+            while not listener.done():
+                ready = asyncio.ensure_future(client.ready.wait())
+                await asyncio.wait((ready, listener), return_when=asyncio.FIRST_COMPLETED)
+                ready.cancel()
+                if client.pending is None:
+                    continue
+                message, client.pending = client.pending, None
+                client.ready.clear()
+                message["cells"] = list(message["cells"].items())
+                writer.write(encodeFrame(json.dumps(message).encode()))
+                await writer.drain()                                            #a slow client waits here - the garden keeps merging into pending
+                client.sent = client.sent + 1
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            self.streams.discard(asyncio.current_task())
+            listener.cancel()
+            writer.close()
+
+    async def listen(self, reader, writer):                                     #client frames: answer pings, stop on close
+        try:
+            while True:
+                opcode, payload = await readFrame(reader)
+                if opcode == 0x8:
+                    writer.write(encodeFrame(payload[:2], 0x8))
+                    return
+                if opcode == 0x9:
+                    writer.write(encodeFrame(payload, 0xA))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+    async def close(self):
+        for client in list(self.clients):
+            client.writer.close()
+        await asyncio.gather(*self.streams, return_exceptions=True)             #let every stream see its client go
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.quiet.close()
+
+
+#CLIENT
+class StreamClient:                                                             #reads the /ws stream of an EdenServer
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write(("GET /ws HTTP/1.1\r\nHost: " + host + ":" + str(port) + "\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      "Sec-WebSocket-Key: " + key + "\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        response = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        if " 101 " not in response.split("\r\n")[0] or acceptKey(key) not in response:
+            writer.close()
+            raise ConnectionError("not an Eden stream: " + response.split("\r\n")[0])
+        return cls(reader, writer)
+
+    async def recv(self):                                                       #next message (dict), None once the server has closed
+        while True:
+            try:
+                opcode, payload = await readFrame(self.reader)
+            except asyncio.IncompleteReadError:
+                return None
+            if opcode == 0x1:
+                return json.loads(payload)
+            if opcode == 0x8:
+                return None
+
+    async def close(self):
+        with contextlib.suppress(ConnectionError):
+            self.writer.write(encodeFrame(struct.pack(">H", 1000), 0x8, mask=True))
+            await self.writer.drain()
+        self.writer.close()
+
+async def fetch(host, port, path):                                              #plain HTTP GET -> (status code, body bytes)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(("GET " + path + " HTTP/1.1\r\nHost: " + host + "\r\nConnection: close\r\n\r\n").encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), body
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Eden</title>
+<style>body{background:#222;color:#eee;font-family:sans-serif;text-align:center}canvas{image-rendering:pixelated;width:90vw;max-width:1120px}</style>
+</head><body>
+<h2 id="title">Eden</h2><canvas id="eden"></canvas><p id="counts"></p><p><a href="/metrics" style="color:#8cf">metrics</a></p>
+<script>
+//terrain colours by value (see the legend in playEden.py)
+const LEGEND = [[0.005,"#dfe6ee"],[0.05,"#f4f4f4"],[0.15,"#6b4a2b"],[0.205,"#8b5a2b"],[0.22,"#f0e6c8"],[0.26,"#5c3b1e"],[0.3,"#7a4f27"],
+  [0.4,"#888888"],[0.6,"#ffd23f"],[0.69,"#2f7d32"],[0.71,"#8fbc8f"],[0.742,"#3a8f3e"],[0.75,"#ff77aa"],[0.754,"#3a8f3e"],[0.8,"#7ccf5a"],[2,"#87ceeb"]];
+const ANIMALS = {ants:"#000000", bflys:"#1e40ff", catp:"#9acd32", lizzys:"#b22222", worms:"#556b2f"};
+const canvas = document.getElementById("eden"), ctx = canvas.getContext("2d");
+let shape = [0, 0], terrain = [];
+function colour(v) { for (const [top, c] of LEGEND) if (v < top) return c; return "#000"; }
+function draw(msg) {
+  for (let i = 0; i < terrain.length; i++) { ctx.fillStyle = colour(terrain[i]); ctx.fillRect(i % shape[1], Math.floor(i / shape[1]), 1, 1); }
+  for (const [name, pos] of Object.entries(msg.agents || {})) {
+    ctx.fillStyle = ANIMALS[name];
+    for (let k = 0; k < pos.length; k += 2) ctx.fillRect(pos[k+1], pos[k], 1, 1);
+  }
+  document.getElementById("title").textContent = "Eden Timestep: " + msg.t + (msg.raining ? "  - It's Raining!" : "");
+  if (msg.counts) document.getElementById("counts").textContent = Object.entries(msg.counts).map(([k, v]) => v + " " + k).join("  ");
+}
+const ws = new WebSocket("ws://" + location.host + "/ws");
+ws.onmessage = (event) => {
+  const msg = JSON.parse(event.data);
+  if (msg.type === "init") { shape = msg.shape; terrain = msg.terrain; canvas.width = shape[1]; canvas.height = shape[0]; }
+  else for (const [i, v] of msg.cells) terrain[i] = v;
+  draw(msg);
+};
+</script></body></html>
+"""
+
+
+def main():
+    from playEden import load_scenario
+
+    parser = argparse.ArgumentParser(description="Stream a headless Eden run to web browsers")
+    parser.add_argument("timesteps", type=int, nargs="?", default=None, help="timesteps to play (default: forever)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=None, help="timesteps per second (default: as fast as it goes)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--world", default=None, help="worldscene csv (default data/worldscene.csv)")
+    parser.add_argument("--alive", default=None, help="alive csv or .npy population file (default data/alive.csv)")
+    parser.add_argument("--log", action="store_true", help="print the garden's log to the terminal")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    scenario = load_scenario(args.world, args.alive)
+    with open(os.devnull, "w") as quiet, contextlib.nullcontext() if args.log else contextlib.redirect_stdout(quiet):
+        garden = Garden(np.array(scenario.backdrop), scenario.critters)
+
+    async def serve():
+        server = EdenServer(garden, args.timesteps, args.rate, args.log)
+        host, port = await server.start(args.host, args.port)
+        print("Eden on http://" + host + ":" + str(port) + "/  (metrics on /metrics, Ctrl+C to stop)")
+        try:
+            await server.run()
+            print("Played", garden.t, "timesteps")
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# edenShared.py
+# Shared-memory scenario data for process-pool workers
+
+"""
+This module places the base terrain and the animals imported from alive.csv in
+multiprocessing shared memory blocks, so that worker processes running worlds
+or domain strips do not each parse the csv files and hold their own copies.
+
+- SharedScenario publishes the blocks once (in the parent process) and gives a
+  small picklable spec that names them.
+- attachArray() maps a block by name with zero copy. Workers either get a
+  read-only view of the base terrain (strip workers copy their window of one
+  world from it), a writable view (the coordinator of edenParallel.py plays
+  on the shared terrain in place), or a copy-on-write view: a private world
+  that only copies the pages of terrain it changes. The copy-on-write map
+  needs the file descriptor CPython's SharedMemory keeps in its private _fd
+  attribute on POSIX; where there is none the world gets a whole private
+  copy instead (the same result, more memory).
+- openWorld() builds a Garden for one world straight from the spec.
+
+The terrain is shared in the padded layout of edenMoves.padTerrain (a SENTINEL
+border round the map), so a Garden uses the shared block in place. The animals
+are held as one typed critter array (edenPopulation.CRITTER_DTYPE) with one row
+per animal.
+"""
+
+
+import mmap
+import numpy as np
+import os
+from multiprocessing import shared_memory
+
+from edenEngine import Garden
+from edenMoves import padTerrain
+
+
+def shareArray(array):                                                          #copy an array into a new shared block, returns (block, spec)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    del shared
+    return block, (block.name, array.shape, array.dtype)
+
+def attachArray(spec, mode="r"):
+    #mode "r" = read-only view, "w" = writable view shared by every process, "c" = copy-on-write (private pages)
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    if mode == "c":
+        fd = getattr(block, "_fd", -1)                                          #CPython only: the private file descriptor SharedMemory mapped (POSIX)
+        if os.name == "nt":
+            buf = mmap.mmap(-1, block.size, tagname=name, access=mmap.ACCESS_COPY)
+        elif fd >= 0:
+            buf = mmap.mmap(fd, block.size, access=mmap.ACCESS_COPY)
+        else:                                                                   #no descriptor to map privately - a whole private copy instead
+            array = np.array(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+            return (block,), array
+        array = np.ndarray(shape, dtype=dtype, buffer=buf)
+        return (block, buf), array
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    if mode == "r":
+        array.flags.writeable = False
+    return (block,), array
+
+def detach(handles):                                                            #drop every array view before calling this
+    for handle in reversed(handles):
+        handle.close()
+
+
+class SharedScenario:
+
+    def __init__(self, backdrop, critters):
+        self.blocks = []
+        terrainblock, terrainspec = shareArray(padTerrain(backdrop))
+        self.blocks.append(terrainblock)
+        critterblock, critterspec = shareArray(np.asarray(critters))
+        self.blocks.append(critterblock)
+        self.spec = {"terrain": terrainspec, "critters": critterspec}           #picklable - send this to the workers
+
+    def close(self):                                                            #parent only, once every worker is done
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def openWorld(spec, mode="c"):
+    #Garden for one world: private copy-on-write terrain (mode "c") or the shared terrain itself (mode "w")
+    basehandles, base = attachArray(spec["terrain"], "r")
+    terrainhandles, terrain = attachArray(spec["terrain"], mode)
+    critterhandles, critters = attachArray(spec["critters"], "r")
+    garden = Garden(critters=critters, LIMITS=base[1:-1, 1:-1], padded=terrain)
+    del critters, terrain, base
+    return garden, basehandles + terrainhandles + critterhandles
@@ -0,0 +1,149 @@
+# edenTerminal.py
+# ANSI terminal view of the Eden garden (for SSH sessions - no display needed)
+
+"""
+Draws the garden as coloured characters in a terminal, one character per
+terrain cell, instead of the matplotlib window:
+
+    python playEden.py 500 D --terminal
+    python playEden.py 50000 N --terminal --render-every 10 --pipeline
+
+Terrain (see the legend in playEden.py):
+    ' ' sky        ' ' clouds (white)   '@' sun         '#' tree
+    '%' bush       '*' flower (pink)    '"' grass       'o' rock
+    ' ' ground     '.' tunnel           '*' fossil (white in the ground)
+    '~' worm tail
+Animals:
+    'a' ant        'B' butterfly (its own colour)       'c' caterpillar
+    'C' cocoon     'L' lizard           'W' worm head
+
+Only the first frame is drawn in full. After that only the cells whose
+character or colour changed are written, each run of changed cells in a row
+after one cursor move, so a frame of the 59x112 world is usually a few KB.
+The title and counts are on the line under the garden.
+"""
+
+
+import numpy as np
+import sys
+
+
+#(lowest value, highest value, character, foreground, background) - 256 colour codes, first match wins
+TERRAIN = (
+    (0.0,   0.01,  " ", 255, 255),                                              #clouds or border
+    (0.1,   0.1,   ".", 137, 52),                                               #tunnel
+    (0.2,   0.2,   " ", 130, 130),                                              #ground
+    (0.21,  0.21,  "*", 231, 130),                                              #fossil
+    (0.25,  0.27,  "#", 94, 58),                                                #tree trunk or branch
+    (0.35,  0.35,  "o", 250, 244),                                              #rock
+    (0.5,   0.5,   "@", 226, 220),                                              #sun
+    (0.7,   0.7,   "~", 108, 130),                                              #worm tail
+    (0.745, 0.745, "*", 213, 28),                                               #flower
+    (0.62,  0.75,  "%", 22, 28),                                                #bush or leaves
+    (0.755, 0.755, '"', 46, 34),                                                #grass
+    (0.755, 1.0,   " ", 117, 117),                                              #blue sky
+)
+NIGHT_SKY = 17                                                                  #sky background at night
+
+#butterfly colours in alive.csv -> 256 colour codes
+COLOURS = {"aquamarine": 122, "blue": 21, "gold": 220, "green": 40, "indigo": 54, "magenta": 201, "orange": 208,
+           "purple": 93, "red": 196, "yellow": 226, "black": 16}
+
+ESC = "\x1b["
+
+
+class TerminalView:
+
+    def __init__(self, out=None, sundial="D"):
+        self.out = sys.stdout if out is None else out
+        self.sundial = sundial
+        self.styles = []                                                        #(character, foreground, background) by style code
+        self.codes = {}
+        terrain = [self.style(char, fg, NIGHT_SKY if sundial == "N" and bg == 117 else bg) for low, high, char, fg, bg in TERRAIN]
+        self.terraincodes = np.array(terrain + [self.style("?", 231, 0)], dtype=np.int32)     #last one for values not in the legend
+        self.grid = None                                                        #style code of every cell as last drawn
+        self.status = None
+        self.written = 0                                                        #characters written for the last frame
+
+    def style(self, char, fg, bg):
+        key = (char, fg, bg)
+        if key not in self.codes:
+            self.codes[key] = len(self.styles)
+            self.styles.append(key)
+        return self.codes[key]
+
+    def cells(self, frame):                                                     #style code of every cell: terrain, then the animals on top
+        terrain = np.asarray(frame.terrain)
+        conditions = [(terrain >= low) & (terrain <= high) for low, high, char, fg, bg in TERRAIN]
+        grid = np.select(conditions, np.arange(len(TERRAIN)), len(TERRAIN))
+        grid = self.terraincodes[grid]
+
+        def put(critter, char, fg):
+            row, col = critter.pos
+            if 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1]:
+                grid[row, col] = self.style(char, fg, self.styles[grid[row, col]][2])
+
+        for worm in frame.worms:
+            put(worm, "W", 22)
+        for ant in frame.ants:
+            put(ant, "a", 16)
+        for c in frame.catp:
+            if c.stage == "cocoon":
+                put(c, "C", 180)
+            elif c.stage == "caterpillar":
+                put(c, "c", 154)
+        for lizzy in frame.lizzys:
+            put(lizzy, "L", 160)
+        for bfly in frame.bflys:
+            put(bfly, "B", COLOURS.get(bfly.colour, 201))
+        return grid
+
+    def statusLine(self, frame):
+        when = "Sundown" if self.sundial == "N" else "Dawn"
+        line = ("Eden Timesteps After " + when + ": " + str(frame.t) + "   " + str(len(frame.fossilpos)) + " Fossils " + str(len(frame.bflys)) +
+                " Butterflies  " + str(frame.finalcatp) + " Caterpillars  " + str(len(frame.ants)) + " Ants  " + str(len(frame.lizzys)) +
+                " Lizards  " + str(len(frame.worms)) + " Worms  " + str(len(frame.flowerpos)) + " Flowers")
+        if frame.raindance:
+            line = line + "   It's Raining!"
+        return line
+
+    def draw(self, frame):                                                      #frame = a Garden or an edenRecord.Frame
+        grid = self.cells(frame)
+        parts = []
+        if self.grid is None or self.grid.shape != grid.shape:                  #first frame: clear the screen and draw everything
+            parts.append(ESC + "?25l" + ESC + "2J")
+            changed = np.arange(grid.size)
+        else:
+            changed = np.flatnonzero(grid != self.grid)
+
+        width = grid.shape[1]
+        flat = grid.ravel()
+        last = None                                                             #style of the last character written
+        nextcell = None                                                         #where the cursor is after the last character
+        for cell in changed.tolist():
+            if cell != nextcell:
+                row, col = divmod(cell, width)
+                parts.append(ESC + str(row+1) + ";" + str(col+1) + "H")
+            char, fg, bg = self.styles[flat[cell]]
+            if (fg, bg) != last:
+                parts.append(ESC + "38;5;" + str(fg) + ";48;5;" + str(bg) + "m")
+                last = (fg, bg)
+            parts.append(char)
+            nextcell = cell + 1 if (cell + 1) % width else None
+
+        status = self.statusLine(frame)
+        if status != self.status:
+            parts.append(ESC + str(grid.shape[0]+1) + ";1H" + ESC + "0m" + ESC + "K" + status)
+            self.status = status
+        parts.append(ESC + "0m" + ESC + str(grid.shape[0]+2) + ";1H")
+
+        text = "".join(parts)
+        self.out.write(text)
+        self.out.flush()
+        self.grid = grid
+        self.written = len(text.encode())
+        return self.written
+
+    def close(self):                                                            #colours back to normal and the cursor back on
+        self.out.write(ESC + "0m" + ESC + "?25h\n")
+        self.out.flush()
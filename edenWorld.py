@@ -0,0 +1,226 @@
+# edenWorld.py
+# Procedural worlds and populations of any size
+
+"""
+Makes a worldscene of any size following the legend in playEden.py, and a
+population of animals to live in it, for load testing and ensemble runs:
+
+    python edenWorld.py 590 1120 runs/world.npy runs/alive.npy --seed 3
+    python playEden.py 100 D runs/world.npy runs/alive.npy
+
+The same seed always makes the same world and population. The layout is the
+one of worldscene.csv, scaled to the size asked for:
+- sky above, with a sun in the top right corner and clouds
+- grass along the top of the ground, with flowers (0.745) in it
+- trees standing on the grass: trunk, a branch and a crown of leaves with
+  flowers, and bushes with flowers
+- rocks on the grass and in the ground
+- ground below, with seams of fossils and ant nests (tunnels)
+- a clouds/border frame all round, with one 1.0 cell in the top left corner
+  so that the colour scale is the same as the hand-made worlds
+
+Animals are placed at a density per cell they can live in (the cells their
+move table lets them enter, see edenMoves.py):
+- ants in the tunnels, butterflies in the sky and the trees, lizards on the
+  grass, trees and rocks above ground, worms in the ground (at least one)
+
+The world is saved as a .npy terrain and the animals as a binary population
+file (edenPopulation.py), so neither has to be parsed when it is loaded.
+"""
+
+
+import argparse
+import numpy as np
+
+from edenPopulation import CRITTER_DTYPE, SPECIES, savePopulation
+
+
+#terrain values (the legend in playEden.py)
+BORDER = 0.0
+CLOUD = 0.01
+TUNNEL = 0.1
+GROUND = 0.2
+FOSSIL = 0.21
+TRUNK = 0.25
+BARK = 0.27
+ROCK = 0.35
+SUN = 0.5
+LEAF_EDGE = 0.62
+FLOWER = 0.745
+LEAVES = 0.75
+GRASS = 0.755
+SKY = 0.83
+
+#animals per cell they can live in
+DENSITY = {"ants": 0.12, "butterflies": 0.01, "lizards": 0.004, "worms": 0.0004}
+COLOURS = ("aquamarine", "blue", "gold", "green", "indigo", "magenta", "orange", "purple", "red", "yellow")
+
+
+def ellipse(rows, cols, centre, radius):                                        #mask of the cells inside an ellipse (radius = (rows, cols))
+    r = np.arange(rows)[:, None]
+    c = np.arange(cols)[None, :]
+    return ((r - centre[0]) / radius[0])**2 + ((c - centre[1]) / radius[1])**2 <= 1
+
+def paint(terrain, top, left, mask, value, where=None):                        #set the cells of mask (placed at top, left) to value, clipped to the terrain
+    rows, cols = terrain.shape
+    r0, c0 = max(top, 0), max(left, 0)
+    r1, c1 = min(top + mask.shape[0], rows), min(left + mask.shape[1], cols)
+    if r0 >= r1 or c0 >= c1:
+        return
+    area = terrain[r0:r1, c0:c1]
+    mask = mask[r0-top:r1-top, c0-left:c1-left]
+    if where is not None:                                                       #only over these terrain values
+        mask = mask & np.isin(area, where)
+    area[mask] = value
+
+
+def makeWorld(rows, cols, seed=None):
+    if rows < 12 or cols < 12:
+        raise ValueError("a world needs at least 12 rows and 12 columns, not " + str(rows) + "x" + str(cols))
+    rng = np.random.default_rng(seed)
+    terrain = np.full((rows, cols), SKY)
+    horizon = rows*30 // 59                                                     #first row of ground (as in worldscene.csv)
+    terrain[horizon:] = GROUND
+
+    #grass: two rows on top of the ground, on gentle hills
+    hill = max(1, horizon // 10)
+    bumps = np.convolve(rng.integers(0, hill + 1, cols + 8), np.ones(9) / 9, mode="valid")
+    grasstop = horizon - 2 - np.rint(bumps).astype(int)                         #first grass row of every column
+    r = np.arange(rows)[:, None]
+    terrain[(r >= grasstop) & (r < horizon)] = GROUND
+    terrain[(r >= grasstop) & (r < grasstop + 2)] = GRASS
+    allcols = np.arange(cols)
+    flowers = rng.random(cols) < 0.04
+    terrain[grasstop[flowers], allcols[flowers]] = FLOWER
+
+    #sun and clouds
+    radius = max(1, rows*2 // 59)
+    paint(terrain, 1, cols - 4 - 2*radius, ellipse(2*radius + 1, 2*radius + 1, (radius, radius), (radius + 0.5, radius + 0.5)), SUN)
+    for n in range(max(1, cols // 40)):
+        height, width = int(rng.integers(1, 3)), int(rng.integers(3, 9))
+        paint(terrain, int(rng.integers(1, max(2, horizon // 4))), int(rng.integers(1, cols)),
+              ellipse(height, width, ((height-1)/2, (width-1)/2), (height/2, width/2)), CLOUD, where=(SKY,))
+
+    #rocks in the ground and on the grass
+    for n in range(max(1, (rows - horizon) * cols // 1500)):
+        size = int(rng.integers(1, 5))
+        paint(terrain, int(rng.integers(horizon + 1, rows)), int(rng.integers(0, cols)),
+              ellipse(2*size + 1, 2*size + 3, (size, size + 1), (size + 0.5, size + 1.5)), ROCK, where=(GROUND,))
+    for n in range(max(1, cols // 60)):
+        size = int(rng.integers(2, 5))
+        col = int(rng.integers(0, cols))
+        paint(terrain, grasstop[col] - size, col - size, ellipse(2*size + 1, 2*size + 1, (size, size), (size + 0.5, size + 0.5)), ROCK)
+
+    #fossil seams: short straight runs of fossils in any direction
+    ground = np.flatnonzero(terrain[horizon:] == GROUND) + horizon*cols
+    seams = rng.choice(ground, max(1, len(ground) // 250))
+    length = rng.integers(2, 6, len(seams))
+    drow, dcol = rng.integers(-1, 2, len(seams)), rng.integers(-1, 2, len(seams))
+    for k in range(5):
+        go = k < length
+        seamrow = np.clip(seams[go] // cols + k*drow[go], 0, rows - 1)
+        seamcol = np.clip(seams[go] % cols + k*dcol[go], 0, cols - 1)
+        fossil = terrain[seamrow, seamcol] == GROUND
+        terrain[seamrow[fossil], seamcol[fossil]] = FOSSIL
+
+    #ant nests: a shaft from the grass down to galleries (tunnels only go through ground and fossils)
+    depth = rows - horizon
+    for n in range(max(1, cols // 56)):
+        col = int(rng.integers(2, cols - 2))
+        bottom = int(rng.integers(horizon + min(3, depth - 2), rows - 1))
+        for shaft in (col, min(col + int(rng.integers(2, 7)), cols - 2)):
+            paint(terrain, grasstop[shaft] + 1, shaft, np.ones((bottom - grasstop[shaft], 1), dtype=bool), TUNNEL, where=(GROUND, FOSSIL, GRASS))
+        for gallery in range(int(rng.integers(2, max(3, depth // 4)))):
+            width = int(rng.integers(3, 9))
+            paint(terrain, int(rng.integers(horizon + 1, bottom + 1)), col - width // 2, np.ones((1, width + 6), dtype=bool), TUNNEL,
+                  where=(GROUND, FOSSIL))
+
+    #trees: a trunk standing on the grass, one branch and a crown of leaves with flowers
+    for n in range(max(1, cols // 28)):
+        col = int(rng.integers(1, cols - 4))
+        base = int(grasstop[col:col+3].max()) + 1
+        top = max(2, int(base - rng.uniform(0.5, 0.8) * horizon))
+        crown = max(2, (base - top) // 4)
+        leaves = ellipse(2*crown + 1, 2*crown + 5, (crown, crown + 2), (crown + 0.5, crown + 2.5))
+        edge = leaves & ~ellipse(2*crown + 1, 2*crown + 5, (crown, crown + 2), (crown - 0.5, crown + 1.5))
+        paint(terrain, top - crown, col - crown - 1, leaves, LEAVES)
+        paint(terrain, top - crown, col - crown - 1, edge, LEAF_EDGE)
+        branch = int(rng.integers(top, base - 1))
+        side = crown + 2 if rng.random() < 0.5 else -crown - 2
+        paint(terrain, branch, min(col, col + side), np.ones((1, abs(side) + 1), dtype=bool), TRUNK)
+        paint(terrain, top, col, np.ones((base - top, 3), dtype=bool), TRUNK)
+        paint(terrain, top, col + 2, np.ones((base - top, 1), dtype=bool), BARK)
+
+    #bushes on the grass
+    for n in range(max(1, cols // 20)):
+        size = int(rng.integers(1, 4))
+        col = int(rng.integers(0, cols))
+        paint(terrain, grasstop[col] - size, col - size - 1, ellipse(size + 1, 2*size + 3, (size, size + 1), (size + 0.5, size + 1.5)), LEAVES,
+              where=(SKY, GRASS))
+
+    #flowers in the leaves
+    leafcells = np.flatnonzero(terrain == LEAVES)
+    terrain.flat[leafcells[rng.random(len(leafcells)) < 0.06]] = FLOWER
+
+    #clouds/border frame
+    terrain[[0, -1], :] = BORDER
+    terrain[:, [0, -1]] = BORDER
+    terrain[0, 0] = 1.0
+    return terrain
+
+
+def makePopulation(terrain, seed=None, density=None):                           #critter array (edenPopulation.CRITTER_DTYPE) for a terrain
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+    density = dict(DENSITY, **(density or {}))
+    rows = np.arange(terrain.shape[0])[:, None]
+    underground = np.flatnonzero(((0 < terrain) & (terrain < 0.22)).mean(axis=1) > 0.5)       #rows that are mostly ground, fossils or tunnels
+    horizon = underground[0] if len(underground) else terrain.shape[0]
+    homes = {                                                                   #cells each species starts in
+        "ants": terrain == TUNNEL,
+        "butterflies": (terrain > 0.36) & (terrain != SUN) & (terrain != 1.0),
+        "lizards": (0.24 < terrain) & (terrain < 0.79) & (rows < horizon),
+        "worms": terrain == GROUND,
+    }
+
+    records = []
+    for species, letter, code in (("ants", "A", 0), ("butterflies", "B", 1), ("lizards", "L", 2), ("worms", "W", 3)):
+        cells = np.flatnonzero(homes[species])
+        n = int(round(density[species] * len(cells)))
+        if species == "worms":
+            n = max(n, 1)
+        if len(cells) == 0 or n == 0:
+            continue
+        chosen = rng.choice(cells, n, replace=n > len(cells))
+        colours = rng.choice(COLOURS, n) if species == "butterflies" else [""] * n
+        hungry = species == "lizards"
+        for i, (cell, colour) in enumerate(zip(chosen.tolist(), colours)):
+            row, col = divmod(cell, terrain.shape[1])
+            records.append((code, letter + str(i + 1), row, col, colour, True, hungry))
+    return np.array(records, dtype=CRITTER_DTYPE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Make an Eden world and population of any size")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("world", help="terrain file to write (.npy)")
+    parser.add_argument("alive", help="population file to write (.npy)")
+    parser.add_argument("--seed", type=int, default=None)
+    for species, default in DENSITY.items():
+        parser.add_argument("--" + species, type=float, default=default, help="animals per cell they can live in (default " + str(default) + ")")
+    args = parser.parse_args()
+
+    try:
+        terrain = makeWorld(args.rows, args.cols, args.seed)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(1)
+    critters = makePopulation(terrain, args.seed, {species: getattr(args, species) for species in DENSITY})
+    np.save(args.world, terrain, allow_pickle=False)
+    savePopulation(args.alive, critters)
+    counts = np.bincount(critters["species"], minlength=len(SPECIES))
+    print("Saved a", str(args.rows) + "x" + str(args.cols), "world to", args.world, "and", len(critters), "animals to", args.alive)
+    print("   ", ",  ".join(str(count) + " " + species for species, count in zip(("ants", "butterflies", "lizards", "worms"), counts.tolist())))
+
+if __name__ == "__main__":
+    main()
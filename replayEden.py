@@ -0,0 +1,115 @@
+# replayEden.py
+# Watch a recorded Eden run without re-simulating it
+
+"""
+Plays a recording made with edenRecord.py in the same matplotlib window as
+playEden.py (playEden.drawGarden), reading each timestep from the recording
+instead of stepping the animals.
+
+    python replayEden.py runs/eden.rec            (Day mode)
+    python replayEden.py runs/eden.rec N --speed 5 --start 200
+
+Controls:
+- the Timestep slider jumps to any timestep
+- space or the Play/Pause button plays and pauses
+- left / right arrows step one timestep back or forward
+- up / down arrows play twice as fast / half as fast (timesteps per frame)
+- r plays backwards, home / end jump to the first / last timestep
+"""
+
+
+import argparse
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Button, Slider
+
+from edenRecord import Recording
+from playEden import drawGarden
+
+
+class Viewer:
+
+    def __init__(self, recording, sundial="D", speed=1, start=1, fps=10):
+        self.recording = recording
+        self.sundial = sundial
+        self.speed = speed                                                      #timesteps moved on for each frame drawn (negative plays backwards)
+        self.fps = fps
+        self.playing = True
+
+        self.fig = plt.figure(figsize=(8,8))
+        self.ax = self.fig.add_axes([0.08, 0.14, 0.88, 0.8])
+        self.ax.set_aspect("equal")
+        self.slider = Slider(self.fig.add_axes([0.12, 0.03, 0.6, 0.03]), "Timestep", 1, len(recording), valinit=start, valstep=1)
+        self.slider.on_changed(self.seek)
+        self.button = Button(self.fig.add_axes([0.82, 0.02, 0.12, 0.05]), "Pause")
+        self.button.on_clicked(lambda event: self.toggle())
+        self.fig.canvas.mpl_connect("key_press_event", self.key)
+        self.seek(start)
+
+    def seek(self, t):                                                          #t = timestep shown in the title (recording frame t-1)
+        self.f = int(t) - 1
+        self.ax.cla()
+        plt.sca(self.ax)
+        drawGarden(self.ax, self.recording.frame(self.f), self.sundial)
+        self.fig.canvas.draw_idle()
+
+    def show(self, f):
+        f = min(max(f, 0), len(self.recording) - 1)
+        if f != self.f:
+            self.slider.set_val(f + 1)                                          #the slider calls seek()
+
+    def toggle(self):
+        self.playing = not self.playing
+        self.button.label.set_text("Pause" if self.playing else "Play")
+
+    def key(self, event):
+        if event.key == " ":
+            self.toggle()
+        elif event.key in ("left", "right"):
+            if self.playing:
+                self.toggle()
+            self.show(self.f + (1 if event.key == "right" else -1))
+        elif event.key == "up":
+            self.speed = self.speed * 2
+        elif event.key == "down" and abs(self.speed) > 1:
+            self.speed = self.speed // 2
+        elif event.key == "r":
+            self.speed = -self.speed
+        elif event.key == "home":
+            self.show(0)
+        elif event.key == "end":
+            self.show(len(self.recording) - 1)
+
+    def play(self):
+        headless = plt.get_backend().lower() == "agg"                          #no window - play through once and stop
+        while plt.fignum_exists(self.fig.number):
+            if self.playing:
+                f = self.f + self.speed
+                if 0 <= f < len(self.recording):
+                    self.show(f)
+                else:                                                           #stop at either end, the slider still works
+                    self.toggle()
+            elif headless:
+                break
+            plt.pause(1 / self.fps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an Eden recording made with edenRecord.py")
+    parser.add_argument("path")
+    parser.add_argument("sundial", nargs="?", default="D", type=str.upper, choices=("D", "N"), help="Day (D) or Night (N) colours")
+    parser.add_argument("--speed", type=int, default=1, help="timesteps moved on for each frame drawn")
+    parser.add_argument("--start", type=int, default=1, help="timestep to start at")
+    parser.add_argument("--fps", type=float, default=10, help="frames drawn per second")
+    args = parser.parse_args()
+
+    try:
+        recording = Recording(args.path)
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        raise SystemExit(1)
+    with recording:
+        viewer = Viewer(recording, args.sundial, args.speed, min(max(args.start, 1), len(recording)), args.fps)
+        viewer.play()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# conftest.py
+# Tests import the Eden modules from the repository root, whatever directory pytest runs in
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,111 @@
+# test_config.py
+# Run configuration: the file, the command line over it, the questions only at a terminal, and behaviour for one garden only
+
+import builtins
+import contextlib
+import io
+import json
+import numpy as np
+import pytest
+import sys
+
+from edenConfig import applyBehaviour, makeConfig
+from edenEngine import HUNGER, Garden
+from playEden import commandLine, load_scenario
+
+
+def test_hunger_is_per_garden():
+    scenario = load_scenario()
+    behaviour = makeConfig()["behaviour"]
+    behaviour.update(ant_hunger=3, butterfly_hunger=4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        hungry = Garden(np.array(scenario.backdrop), scenario.critters, **applyBehaviour(behaviour))
+        plain = Garden(np.array(scenario.backdrop), scenario.critters)
+    assert {ant.fullfor for ant in hungry.ants} == {3}
+    assert {bfly.fullfor for bfly in hungry.bflys} == {4}
+    assert {ant.fullfor for ant in plain.ants} == {HUNGER[0]}                   #the first garden did not change the defaults
+    assert {bfly.fullfor for bfly in plain.bflys} == {HUNGER[1]}
+
+
+class Batch(io.StringIO):                                                       #stdin of a batch job
+    def isatty(self):
+        return False
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def noPrompt(prompt=""):
+    raise AssertionError("prompted with " + repr(prompt))
+
+
+@pytest.mark.parametrize("argv", [[], ["100"], ["--sundial", "N"], ["many", "D"], ["100", "X"]])
+def test_batch_job_is_never_prompted(monkeypatch, capsys, argv):
+    monkeypatch.setattr(sys, "stdin", Batch())
+    monkeypatch.setattr(builtins, "input", noPrompt)
+    with pytest.raises(SystemExit) as exit:
+        commandLine(argv)
+    assert exit.value.code == 1
+    assert "are needed" in capsys.readouterr().out
+
+def test_terminal_is_prompted(monkeypatch, capsys):
+    answers = iter(["0", "five", "5", "x", "n"])
+    monkeypatch.setattr(sys, "stdin", Terminal())
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+    config = commandLine([])
+    assert config["run"]["steps"] == 5 and config["run"]["sundial"] == "N"
+
+def test_batch_job_with_everything_given(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", Batch())
+    monkeypatch.setattr(builtins, "input", noPrompt)
+    config = commandLine(["100", "d", "--renderer", "none"])
+    assert config["run"]["steps"] == 100 and config["run"]["sundial"] == "D"
+
+
+def writeConfig(tmp_path, kind, config):
+    path = tmp_path / ("run." + kind)
+    if kind == "json":
+        path.write_text(json.dumps(config))
+    else:
+        path.write_text("\n".join("[" + section + "]\n" + "\n".join(key + " = " + json.dumps(value) for key, value in settings.items())
+                                  for section, settings in config.items()) + "\n")
+    return str(path)
+
+@pytest.mark.parametrize("kind", ["toml", "json"])
+def test_command_line_wins_over_file(tmp_path, kind):
+    path = writeConfig(tmp_path, kind, {"run": {"steps": 2000, "sundial": "N", "seed": 7, "sync": True},
+                                        "render": {"renderer": "none", "rate": 5},
+                                        "behaviour": {"ant_hunger": 30, "rain_start": 10}})
+    config = commandLine(["--config", path, "--seed", "8", "--ant-hunger", "31", "--no-sync", "--rate", "2.5"])
+    assert config["run"] == {"steps": 2000, "sundial": "N", "seed": 8, "world": None, "alive": None, "sync": False}
+    assert config["render"]["renderer"] == "none" and config["render"]["rate"] == 2.5
+    assert config["behaviour"]["ant_hunger"] == 31
+    assert config["behaviour"]["rain_start"] == 10                              #from the file
+    assert config["behaviour"]["butterfly_hunger"] == HUNGER[1]                 #in neither - the default
+    assert commandLine(["50", "d", "--config", path])["run"]["steps"] == 50     #the timesteps argument too
+
+@pytest.mark.parametrize("kind", ["toml", "json"])
+@pytest.mark.parametrize("config, message", [
+    ({"run": {"steps": "many"}}, "run.steps must be a whole number"),
+    ({"run": {"steps": True}}, "run.steps must be a whole number"),             #a bool is not a number
+    ({"run": {"sync": 1}}, "run.sync must be true or false"),
+    ({"render": {"pause": "slow"}}, "render.pause must be a number"),
+    ({"run": {"stesp": 100}}, "unknown setting run.stesp"),
+    ({"weather": {"rain": 3}}, "unknown section 'weather'"),
+    ({"render": {"renderer": "opengl"}}, "render.renderer must be one of"),
+    ({"behaviour": {"rain_start": 60}}, "rain_start must be before"),
+])
+def test_bad_settings(tmp_path, kind, config, message):
+    path = writeConfig(tmp_path, kind, config)
+    with pytest.raises(ValueError, match=message):
+        makeConfig(path)
+
+def test_bad_settings_stop_the_command_line(tmp_path, capsys):
+    path = writeConfig(tmp_path, "toml", {"run": {"steps": "many"}})
+    with pytest.raises(SystemExit) as exit:
+        commandLine(["--config", path])
+    assert exit.value.code == 1
+    assert "run.steps must be a whole number" in capsys.readouterr().out
+    with pytest.raises(SystemExit) as exit:
+        commandLine(["100", "D", "--ant-hunger", "lots"])                       #argparse checks the flags
+    assert exit.value.code == 2
@@ -0,0 +1,34 @@
+# test_fields.py
+# The distance fields repaired cell by cell must match fields built from scratch
+
+import contextlib
+import io
+import numpy as np
+import random
+
+from edenEngine import Garden
+from edenFields import DistanceField, isFossil, isFlower
+from edenWorld import makeWorld, makePopulation
+
+
+def checkFields(garden):
+    for field, table, isfood in ((garden.fossilfield, "ant", isFossil), (garden.flowerfield, "butterfly", isFlower)):
+        rebuilt = DistanceField(garden.tables[table], garden.padded, isfood)
+        assert np.array_equal(field.dist, rebuilt.dist), table + " field differs from a full rebuild"
+
+def playAndCheck(sync):
+    random.seed(5)
+    terrain = makeWorld(60, 110, seed=5)
+    critters = makePopulation(terrain, seed=5, density={"worms": 0.004})
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = Garden(terrain, critters, sync=sync)
+        for t in range(60):                                                     #past the rain (timesteps 36 to 49) and many worm lives
+            garden.step()
+            checkFields(garden)
+
+
+def test_fields_serial():
+    playAndCheck(sync=False)
+
+def test_fields_sync():
+    playAndCheck(sync=True)
@@ -0,0 +1,26 @@
+# test_imports.py
+# Importing the Eden modules reads no files, so it works from any working directory
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import Eden
+from conftest import ROOT
+
+
+def test_import_from_another_directory(tmp_path):
+    env = dict(os.environ, PYTHONPATH=ROOT, MPLBACKEND="Agg")
+    done = subprocess.run([sys.executable, "-c", "import playEden, edenEngine"], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert done.returncode == 0, done.stdout + done.stderr
+
+def test_missing_cartoon_raises(monkeypatch, tmp_path):
+    monkeypatch.setattr(Eden, "CRITTERS_DIR", str(tmp_path))
+    Eden.critterMarker.cache_clear()
+    try:
+        with pytest.raises(FileNotFoundError):
+            Eden.critterMarker("ant")
+    finally:
+        Eden.critterMarker.cache_clear()
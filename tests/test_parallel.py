@@ -0,0 +1,76 @@
+# test_parallel.py
+# The strip-parallel engine draws in another order, so it must match the serial engine in distribution
+
+import contextlib
+import io
+import numpy as np
+import threading
+
+import edenParallel
+from edenCheck import checkStatistical
+from edenParallel import ParallelGarden
+from playEden import load_scenario
+
+
+def test_parallel_matches_serial():
+    scenario = load_scenario()
+    t, found = checkStatistical("serial", "parallel", np.array(scenario.backdrop), scenario.critters, range(1, 7), 100, 50, 0.001)
+    assert t is None, "diverged at timestep " + str(t) + ": " + found
+
+def test_parallel_keeps_every_animal():
+    scenario = load_scenario()
+    eden = ParallelGarden(np.array(scenario.backdrop), scenario.critters, workers=2, seed=1)
+    try:
+        before = eden.counts()
+        for t in range(20):
+            eden.step()
+        after = eden.counts()
+    finally:
+        eden.close()
+    assert after["ants"] == before["ants"] and after["lizards"] == before["lizards"]
+
+def test_worker_windows_follow_the_terrain(monkeypatch):
+    #run the strip workers as threads to look inside them: after every timestep each one's private window
+    #must hold the shared terrain, but for the cells changed in that timestep (they reach it with the next one)
+    workers = {}
+
+    class Recorded(edenParallel.Garden):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if threading.current_thread().name.startswith("strip"):
+                workers[int(threading.current_thread().name[5:])] = self
+
+    class Thread(threading.Thread):
+        def __init__(self, target, args, daemon):
+            super().__init__(target=target, args=args, daemon=daemon, name="strip" + str(args[0]))
+
+    class Kept:                                                                 #a thread shares the pipe end the coordinator closes
+        def __init__(self, conn):
+            self.conn = conn
+        def __getattr__(self, name):
+            return getattr(self.conn, name)
+        def close(self):
+            pass
+
+    pipe = edenParallel.mp.Pipe
+    monkeypatch.setattr(edenParallel, "Garden", Recorded)
+    monkeypatch.setattr(edenParallel.mp, "Process", Thread)
+    monkeypatch.setattr(edenParallel.mp, "Pipe", lambda: (lambda a, b: (a, Kept(b)))(*pipe()))
+
+    scenario = load_scenario()
+    with contextlib.redirect_stdout(io.StringIO()):
+        eden = ParallelGarden(np.array(scenario.backdrop), scenario.critters, workers=3, seed=2)
+        try:
+            for t in range(60):                                                 #past the rain and a worm death
+                eden.step()
+                for rank, garden in workers.items():
+                    top, left, bottom, right = eden.windows[rank]
+                    lag = np.zeros((bottom - top, right - left), dtype=bool)
+                    for source, rows, cols, values in eden.changed:
+                        inside = edenParallel.inWindow(rows, cols, eden.windows[rank])
+                        lag[rows[inside] - top, cols[inside] - left] = True
+                    differ = (garden.terrain != eden.terrain[top:bottom, left:right]) & ~lag
+                    assert not differ.any(), "worker " + str(rank) + " window differs at timestep " + str(t + 1)
+        finally:
+            eden.close()
+    assert len(workers) == 3
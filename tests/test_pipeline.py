@@ -0,0 +1,35 @@
+# test_pipeline.py
+# An engine that fails must fail the Pipeline, and a quiet engine thread must leave sys.stdout alone
+
+import numpy as np
+import pytest
+import random
+import sys
+
+from edenConfig import OPTIONS
+from edenPipeline import Pipeline
+from playEden import load_scenario
+
+
+def behaviour(**changes):
+    found = {key: option[0] for key, option in OPTIONS["behaviour"].items()}
+    found.update(changes)
+    return found
+
+
+@pytest.mark.parametrize("process", [False, True])
+def test_engine_error_is_raised(process):
+    scenario = load_scenario()
+    wrong = behaviour(worm_life_min=30, worm_life_max=12)                       #the garden can not choose a worm life
+    with Pipeline(scenario.backdrop, scenario.critters, 5, process=process, quiet=True, behaviour=wrong) as frames:
+        with pytest.raises(ValueError):
+            list(frames)
+
+def test_quiet_thread_keeps_stdout():
+    scenario = load_scenario()
+    random.seed(1)
+    stdout = sys.stdout
+    with Pipeline(scenario.backdrop, scenario.critters, 5, process=False, quiet=True, behaviour=behaviour()) as frames:
+        played = [frame.t for frame in frames]
+    assert played == [1, 2, 3, 4, 5]
+    assert sys.stdout is stdout
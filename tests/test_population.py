@@ -0,0 +1,84 @@
+# test_population.py
+# alive.csv rows are checked against their species' schema, and population files load back unchanged
+
+import numpy as np
+import pytest
+
+from edenPopulation import CRITTER_DTYPE, TEXT_BYTES, checkText, loadPopulation, parseCritter, savePopulation
+
+
+def test_good_rows():
+    ant = parseCritter("Ant:A1:3:4:alive:False:fossilpos".split(":"))
+    bfly = parseCritter("Butterfly:B1:20:25:yellow:dead:True:flowerpos".split(":"))
+    assert ant == (0, "A1", 3, 4, "", True, False)
+    assert bfly == (1, "B1", 20, 25, "yellow", False, True)
+
+
+@pytest.mark.parametrize("line, message", [
+    ("Snail:S1:3:4:alive:False", "unknown species"),
+    ("Ant:A1:3:4:alive:False", "needs 6 columns"),                              #fossilpos missing
+    ("Lizard:L1:3:4:alive:False:extra", "needs 5 columns"),
+    ("Worm:W1:3:4:alive", "needs 5 columns"),
+    ("Ant:A1:3:4:alive:False:flowerpos", "last column must be 'fossilpos'"),
+])
+def test_malformed_rows(line, message):
+    with pytest.raises(ValueError, match=message):
+        parseCritter(line.split(":"))
+
+
+@pytest.mark.parametrize("line, message", [
+    ("Lizard:L1:three:4:alive:False", "row must be a whole number"),
+    ("Lizard:L1:3:4.5:alive:False", "col must be a whole number"),
+    ("Lizard:L1:3:4:sleeping:False", "status must be 'alive' or 'dead'"),
+    ("Lizard:L1:3:4:alive:false", "hungry must be 'True' or 'False'"),          #a string "false" would be truthy
+    ("Lizard:L1:3:4:alive:1", "hungry must be 'True' or 'False'"),
+])
+def test_bad_types(line, message):
+    with pytest.raises(ValueError, match=message):
+        parseCritter(line.split(":"))
+
+
+def test_long_and_non_ascii_text():
+    assert checkText("name", "x" * TEXT_BYTES, "here") == "x" * TEXT_BYTES
+    with pytest.raises(ValueError, match="longer than " + str(TEXT_BYTES)):
+        parseCritter(("Worm:" + "W" * (TEXT_BYTES + 1) + ":3:4:alive:False").split(":"))
+    with pytest.raises(ValueError, match="colour .* longer than"):
+        parseCritter(("Butterfly:B1:3:4:" + "y" * (TEXT_BYTES + 1) + ":alive:False:flowerpos").split(":"))
+    with pytest.raises(ValueError, match="plain ASCII"):
+        parseCritter("Worm:Wé:3:4:alive:False".split(":"))
+
+
+def test_line_numbers(tmp_path):
+    alive = tmp_path / "alive.csv"
+    alive.write_text("Lizard:L1:3:4:alive:False\n\nLizard:L2:3:4:alive:maybe\n")
+    with pytest.raises(ValueError, match="line 3: hungry"):
+        loadPopulation(str(alive))
+
+
+def test_binary_roundtrip(tmp_path):
+    alive = tmp_path / "alive.csv"
+    alive.write_text("Butterfly:B1:20:25:yellow:alive:False:flowerpos\n"
+                     "Ant:A1:3:4:dead:True:fossilpos\n"
+                     "Worm:" + "W" * TEXT_BYTES + ":7:8:alive:False\n")
+    critters = loadPopulation(str(alive))
+    assert critters.dtype == CRITTER_DTYPE and len(critters) == 3
+    population = str(tmp_path / "alive.npy")
+    savePopulation(population, critters)
+    loaded = loadPopulation(population)
+    assert loaded.dtype == CRITTER_DTYPE
+    assert np.array_equal(loaded, critters)
+    assert loaded["name"][2].decode() == "W" * TEXT_BYTES                       #the longest name is kept whole
+
+
+def test_save_checks_records(tmp_path):
+    population = tmp_path / "alive.npy"
+    with pytest.raises(ValueError, match="longer than"):
+        savePopulation(str(population), [(3, "W" * (TEXT_BYTES + 1), 7, 8, "", True, False)])
+    assert not population.exists()
+
+
+def test_not_a_population_file(tmp_path):
+    other = str(tmp_path / "other.npy")
+    np.save(other, np.zeros(3))
+    with pytest.raises(ValueError, match="not an Eden population file"):
+        loadPopulation(other)
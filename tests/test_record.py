@@ -0,0 +1,48 @@
+# test_record.py
+# Every timestep read back from a recording is the garden as it was when it was recorded
+
+import contextlib
+import io
+import numpy as np
+import pytest
+import random
+
+from edenEngine import Garden
+from edenRecord import KINDS, Recorder, Recording, snapshot
+from playEden import load_scenario
+
+
+def looks(frame):                                                               #what playEden.drawGarden() reads from a Frame
+    animals = {kind: [(critter.name, critter.pos, getattr(critter, "colour", ""), getattr(critter, "stage", None), list(getattr(critter, "oldtail", ())))
+                      for critter in getattr(frame, kind)] for kind in KINDS}
+    return {"t": frame.t, "animals": animals, "finalcatp": frame.finalcatp, "raindance": frame.raindance,
+            "allflooded": [tuple(cell) for cell in frame.allflooded],
+            "rain": (frame.rain_r, frame.rain_c, frame.rain_r2, frame.rain_c2),
+            "flowers": [flower.getPos() for flower in frame.flowerpos], "fossils": [fossil.getPos() for fossil in frame.fossilpos]}
+
+
+@pytest.mark.parametrize("every", [1, 7, 50])
+def test_frames_match_live_garden(tmp_path, every):
+    timesteps = 60                                                              #through the rain (edenEngine.RAIN) and past several worm lives
+    scenario = load_scenario()
+    path = str(tmp_path / "eden.rec")
+    random.seed(4)
+    live = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = Garden(np.array(scenario.backdrop), scenario.critters)
+        with Recorder(path, garden, every) as recorder:
+            for t in range(timesteps):
+                garden.step()
+                recorder.capture()
+                live.append(snapshot(garden))
+    assert any(frame.raindance for frame in live)
+
+    with Recording(path) as recording:
+        assert len(recording) == timesteps
+        for f in range(timesteps):
+            frame = recording.frame(f)
+            assert np.array_equal(frame.terrain, live[f].terrain), f
+            assert np.array_equal(frame.LIMITS, live[f].LIMITS)
+            assert looks(frame) == looks(live[f]), f
+        with pytest.raises(IndexError):
+            recording.frame(timesteps)
@@ -0,0 +1,21 @@
+# test_reference.py
+# Garden must make exactly the moves of the plain reference engine (edenReference.py)
+
+import numpy as np
+
+from edenCheck import checkExact
+from edenWorld import makeWorld, makePopulation
+from playEden import load_scenario
+
+
+def test_serial_matches_reference():
+    scenario = load_scenario()
+    for seed in (1, 2):
+        t, found = checkExact("reference", "serial", np.array(scenario.backdrop), scenario.critters, seed, 120)
+        assert t is None, "diverged at timestep " + str(t) + ": " + found
+
+def test_serial_matches_reference_generated():
+    terrain = makeWorld(60, 110, seed=6)
+    critters = makePopulation(terrain, seed=6, density={"ants": 0.3, "worms": 0.003})
+    t, found = checkExact("reference", "serial", terrain, critters, 6, 120)
+    assert t is None, "diverged at timestep " + str(t) + ": " + found
@@ -0,0 +1,67 @@
+# test_server.py
+# A StreamClient on the loopback must rebuild the served terrain exactly, and /metrics must answer
+
+import asyncio
+import contextlib
+import io
+import json
+import numpy as np
+import random
+
+from edenEngine import PHASES, Garden
+from edenServer import KINDS, EdenServer, StreamClient, fetch
+from playEden import load_scenario
+
+
+TIMESTEPS = 40
+
+
+async def follow(client, timesteps):                                            #terrain and animals as the client sees them after the last timestep
+    message = await client.recv()
+    assert message["type"] == "init"
+    terrain = np.array(message["terrain"]).reshape(message["shape"])
+    agents = None
+    while message["t"] < timesteps:
+        message = await asyncio.wait_for(client.recv(), timeout=30)
+        assert message is not None and message["type"] == "step"
+        for cell, value in message["cells"]:
+            terrain.flat[cell] = value
+        agents = message["agents"]
+    return terrain, agents
+
+async def serve(garden):
+    server = EdenServer(garden, TIMESTEPS, rate=200)                            #slow enough for the second client to join in time
+    host, port = await server.start("127.0.0.1", 0)                             #a free port
+    try:
+        first = await StreamClient.connect(host, port)                          #sees every timestep
+        playing = asyncio.ensure_future(server.run())
+        while garden.t < TIMESTEPS // 2:
+            await asyncio.sleep(0)
+        second = await StreamClient.connect(host, port)                         #joins half way
+        seen = await asyncio.gather(follow(first, TIMESTEPS), follow(second, TIMESTEPS))
+        await playing
+
+        status, body = await fetch(host, port, "/metrics")
+        metrics = json.loads(body)
+        for client in (first, second):
+            await client.close()
+        return seen, status, metrics
+    finally:
+        await server.close()
+
+
+def test_clients_rebuild_the_terrain():
+    scenario = load_scenario()
+    random.seed(4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = Garden(np.array(scenario.backdrop), scenario.critters)
+    seen, status, metrics = asyncio.run(serve(garden))
+
+    for terrain, agents in seen:
+        assert np.array_equal(terrain, garden.terrain)
+        assert agents == {name: [value for critter in getattr(garden, name) for value in critter.pos] for name in KINDS}
+    assert status == 200
+    assert metrics["t"] == TIMESTEPS
+    assert metrics["timesteps_per_second"] > 0
+    assert list(metrics["phase_ms"]) == list(PHASES)
+    assert len(metrics["clients"]) == 2
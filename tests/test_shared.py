@@ -0,0 +1,79 @@
+# test_shared.py
+# Worlds opened from a SharedScenario write only to their own pages, never to the shared block
+
+import contextlib
+import gc
+import io
+import numpy as np
+import os
+import random
+from multiprocessing import shared_memory
+
+import edenShared
+from edenMoves import padTerrain
+from edenShared import SharedScenario, attachArray, detach, openWorld
+from playEden import load_scenario
+
+
+def sharedTerrain(spec):
+    handles, terrain = attachArray(spec["terrain"], "r")
+    found = np.array(terrain)
+    del terrain
+    detach(handles)
+    return found
+
+def playWorld(spec, seed, timesteps):                                           #terrain of one copy-on-write world after timesteps
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden, handles = openWorld(spec, "c")
+        for t in range(timesteps):
+            garden.step()
+    terrain = np.array(garden.padded)
+    del garden
+    gc.collect()
+    detach(handles)
+    return terrain
+
+
+def test_copy_on_write_worlds_do_not_leak():
+    scenario = load_scenario()
+    base = padTerrain(scenario.backdrop)
+    with SharedScenario(scenario.backdrop, scenario.critters) as shared:
+        first = playWorld(shared.spec, 1, 40)
+        second = playWorld(shared.spec, 2, 40)
+        assert not np.array_equal(first, base)                                  #the worlds did dig
+        assert not np.array_equal(first, second)
+        assert np.array_equal(sharedTerrain(shared.spec), base, equal_nan=True)
+
+def test_writable_view_is_shared():
+    scenario = load_scenario()
+    with SharedScenario(scenario.backdrop, scenario.critters) as shared:
+        handles, terrain = attachArray(shared.spec["terrain"], "w")
+        terrain[1, 1] = 0.5
+        del terrain
+        detach(handles)
+        assert sharedTerrain(shared.spec)[1, 1] == 0.5
+
+class NoDescriptor(shared_memory.SharedMemory):                                 #a SharedMemory without the private _fd of CPython
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fd, self._fd = getattr(self, "_fd", -1), -1
+
+    def close(self):
+        super().close()
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def test_copy_without_a_descriptor(monkeypatch):
+    scenario = load_scenario()
+    with SharedScenario(scenario.backdrop, scenario.critters) as shared:
+        monkeypatch.setattr(edenShared.shared_memory, "SharedMemory", NoDescriptor)
+        handles, terrain = attachArray(shared.spec["terrain"], "c")
+        assert len(handles) == 1                                                #the private copy, not a map
+        terrain[1, 1] = 0.5
+        del terrain
+        detach(handles)
+        assert sharedTerrain(shared.spec)[1, 1] != 0.5
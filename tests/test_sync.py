@@ -0,0 +1,43 @@
+# test_sync.py
+# In sync mode the order of the animal lists must not change what happens
+
+import contextlib
+import io
+import numpy as np
+import pytest
+import random
+
+from edenEngine import Garden
+from edenWorld import makeWorld, makePopulation
+from playEden import load_scenario
+
+
+KINDS = ("ants", "bflys", "lizzys", "worms", "catp")
+
+
+def play(terrain, critters, timesteps, shuffle):                                #terrain and {kind: [(name, pos)]} after timesteps
+    order = random.Random(shuffle)                                              #its own stream - the garden's draws stay the same
+    random.seed(9)
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = Garden(np.array(terrain), critters, sync=True)
+        for t in range(timesteps):
+            if shuffle is not None:
+                for kind in ("ants", "bflys", "lizzys", "worms"):
+                    order.shuffle(getattr(garden, kind))
+            garden.step()
+    return garden.terrain.copy(), {kind: sorted((animal.name, animal.pos) for animal in getattr(garden, kind)) for kind in KINDS}
+
+def scenarios():
+    scenario = load_scenario()
+    yield "eden", scenario.backdrop, scenario.critters
+    terrain = makeWorld(80, 150, seed=6)
+    yield "generated", terrain, makePopulation(terrain, seed=6, density={"ants": 0.3, "worms": 0.003})
+
+
+@pytest.mark.parametrize("name, terrain, critters", list(scenarios()))
+def test_order_does_not_matter(name, terrain, critters):
+    expected, where = play(terrain, critters, 60, None)                         #past the rain (timesteps 36 to 49) and the first worm deaths
+    for shuffle in (1, 2):
+        got, gotwhere = play(terrain, critters, 60, shuffle)
+        assert np.array_equal(got, expected)
+        assert gotwhere == where
@@ -0,0 +1,51 @@
+# test_worms.py
+# Every worm dies at its own age, none skips its move, and a new one is born for every one that dies
+
+import contextlib
+import io
+import pytest
+import random
+
+from edenEngine import Garden, WORMLIFE
+from edenWorld import makeWorld, makePopulation
+
+
+def wormGarden(sync):
+    random.seed(2)
+    terrain = makeWorld(100, 180, seed=2)
+    critters = makePopulation(terrain, seed=2, density={"worms": 0.002})
+    return Garden(terrain, critters, sync=sync)
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_worms_die_at_their_own_age(sync):
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = wormGarden(sync)
+        first = list(garden.worms)
+        assert len(first) > 1
+        assert all(WORMLIFE[0] <= worm.lifespan <= WORMLIFE[1] for worm in first)
+        assert len({worm.lifespan for worm in first}) > 1                       #not one life for every worm
+        for t in range(WORMLIFE[1] + 5):
+            ages = {worm: len(worm.oldtail) for worm in garden.worms}
+            garden.step()
+            for worm, age in ages.items():
+                if age + 1 >= worm.lifespan:
+                    assert worm.status == "dead" and worm not in garden.worms
+                else:
+                    assert worm.status == "alive" and len(worm.oldtail) == age + 1    #every live worm moved once
+    assert all(worm.status == "dead" for worm in first)
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_worms_keep_their_number(sync):
+    with contextlib.redirect_stdout(io.StringIO()):
+        garden = wormGarden(sync)
+        count = len(garden.worms)
+        born = set()
+        for t in range(3 * WORMLIFE[1]):
+            garden.step()
+            assert len(garden.worms) == count                                   #the dead are all replaced, not one at a time
+            names = [worm.name for worm in garden.worms]
+            assert len(set(names)) == count
+            born.update(names)
+    assert len(born) > 2 * count